@@ -6,7 +6,7 @@ Gestion du stockage et de la recherche d'embeddings
 from qdrant_client import QdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import CollectionStatus
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import numpy as np
 import logging
 import uuid
@@ -95,28 +95,60 @@ class VectorDatabase:
             logger.error(f"Erreur suppression collection {collection}: {e}")
             raise
 
+    def delete_older_than(self, cutoff: float, field: str = "timestamp",
+                          collection_name: Optional[str] = None):
+        """
+        Supprime les points dont le champ numérique `field` est antérieur à cutoff
+
+        Args:
+            cutoff: Borne exclue (secondes depuis l'epoch)
+            field: Champ du payload comparé
+            collection_name: Nom de la collection (optionnel)
+        """
+        collection = collection_name or self.collection_name
+
+        try:
+            self.client.delete(
+                collection_name=collection,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(must=[
+                        models.FieldCondition(key=field, range=models.Range(lt=cutoff))
+                    ])
+                )
+            )
+            logger.info(f"Points antérieurs à {cutoff} supprimés de {collection}")
+
+        except Exception as e:
+            logger.error(f"Erreur suppression points {collection}: {e}")
+            raise
+
     def add_documents(self, documents: List[Dict[str, Any]],
-                     embeddings: np.ndarray) -> List[str]:
+                     embeddings: np.ndarray,
+                     ids: Optional[List[Union[int, str]]] = None) -> List[Union[int, str]]:
         """
         Ajoute des documents avec leurs embeddings
 
         Args:
             documents: Liste de dicts avec 'text', 'metadata', etc.
             embeddings: Matrice numpy des embeddings
+            ids: IDs des points (entiers non signés ou UUID, optionnel): un document
+                ré-ajouté avec le même ID remplace le précédent. Par défaut, UUID aléatoires
 
         Returns:
             Liste des IDs des documents ajoutés
         """
         if len(documents) != len(embeddings):
             raise ValueError("Nombre de documents != nombre d'embeddings")
+        if ids is not None and len(ids) != len(documents):
+            raise ValueError("Nombre de documents != nombre d'IDs")
 
         points = []
-        ids = []
+        point_ids = []
 
         for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-            # Générer un ID unique
-            doc_id = str(uuid.uuid4())
-            ids.append(doc_id)
+            # ID fourni par l'appelant, sinon ID unique
+            doc_id = ids[i] if ids is not None else str(uuid.uuid4())
+            point_ids.append(doc_id)
 
             # Préparer le point pour Qdrant
             point = models.PointStruct(
@@ -140,7 +172,7 @@ class VectorDatabase:
             )
 
             logger.info(f"Ajouté {len(points)} documents à la collection")
-            return ids
+            return point_ids
 
         except Exception as e:
             logger.error(f"Erreur ajout documents: {e}")
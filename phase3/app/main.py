@@ -6,10 +6,9 @@ Interface utilisateur pour l'agent capable de recherches web intelligentes
 import streamlit as st
 import sys
 import os
-import time
 from datetime import datetime
+from functools import cached_property
 from typing import List, Dict, Any
-import json
 
 # Ajouter le répertoire parent au path pour imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,6 +27,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Nombre de messages récents rendus individuellement (les plus anciens sont regroupés)
+RECENT_MESSAGES = 20
+
 # Initialisation de l'état de session
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -39,9 +41,15 @@ if "rag_pipeline" not in st.session_state:
 class WebAwareChatInterface:
     """Interface de chat pour l'agent web-aware"""
 
-    def __init__(self):
-        self.web_agent = st.session_state.web_agent
-        self.rag_pipeline = st.session_state.rag_pipeline
+    @cached_property
+    def web_agent(self):
+        """Agent web-aware partagé (lu une seule fois dans la session)"""
+        return st.session_state.web_agent
+
+    @cached_property
+    def rag_pipeline(self):
+        """Pipeline RAG étendu partagé (lu une seule fois dans la session)"""
+        return st.session_state.rag_pipeline
 
     def display_sidebar(self):
         """Affiche la sidebar avec les paramètres"""
@@ -109,8 +117,20 @@ class WebAwareChatInterface:
         - "Quelles sont les dernières actualités sur l'IA ?"
         """)
 
-        # Affichage des messages
-        for message in st.session_state.messages:
+        messages = st.session_state.messages
+        older = messages[:-RECENT_MESSAGES]
+        recent = messages[-RECENT_MESSAGES:]
+
+        # Historique ancien: un seul bloc markdown replié
+        if older:
+            with st.expander(f"📜 Afficher les {len(older)} messages précédents", expanded=False):
+                st.markdown("\n\n---\n\n".join(
+                    f"**{'👤 Vous' if message['role'] == 'user' else '🤖 Agent'}:** {message['content']}"
+                    for message in older
+                ))
+
+        # Messages récents: rendu interactif complet
+        for message in recent:
             with st.chat_message(message["role"]):
                 st.markdown(message["content"])
 
@@ -202,12 +222,15 @@ class WebAwareChatInterface:
 
     def process_user_input(self, user_input: str, params: Dict[str, Any]):
         """Traite l'entrée utilisateur et génère une réponse"""
+        # Horodatage unique partagé par tous les messages du tour
+        now = datetime.now().isoformat()
+
         try:
             # Ajouter le message utilisateur
             st.session_state.messages.append({
                 "role": "user",
                 "content": user_input,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now
             })
 
             # Afficher le message utilisateur
@@ -222,33 +245,44 @@ class WebAwareChatInterface:
                 # Afficher la réponse
                 st.markdown(response["answer"])
 
-                # Préparer les métadonnées
-                metadata = {
-                    "search_strategy": response.get("search_strategy", "unknown"),
-                    "processing_time": response.get("processing_time", 0),
-                    "sub_questions_count": response.get("sub_questions_count", 0),
-                    "web_sources": response.get("web_sources", []),
-                    "local_sources": response.get("local_sources", 0),
-                    "sources": response.get("sources", []),
-                    "context_chunks": response.get("context_chunks", 0),
-                    "context_length": response.get("context_length", 0),
-                    "timestamp": datetime.now().isoformat()
-                }
-
-                # Ajouter les étapes séquentielles si présentes
-                if "sequential_steps" in response:
-                    metadata["sequential_steps"] = response["sequential_steps"]
-
-                # Ajouter le message assistant avec métadonnées
-                st.session_state.messages.append({
+                # Préparer uniquement les métadonnées demandées par l'utilisateur
+                want_meta = (
+                    params["show_sources"]
+                    or params["show_search_strategy"]
+                    or params["show_processing_time"]
+                )
+                metadata = {"timestamp": now}
+
+                if params["show_search_strategy"]:
+                    metadata["search_strategy"] = response.get("search_strategy", "unknown")
+                    metadata["sub_questions_count"] = response.get("sub_questions_count", 0)
+
+                    # Ajouter les étapes séquentielles si présentes
+                    if "sequential_steps" in response:
+                        metadata["sequential_steps"] = response["sequential_steps"]
+
+                if params["show_processing_time"]:
+                    metadata["processing_time"] = response.get("processing_time", 0)
+
+                if params["show_sources"]:
+                    metadata["web_sources"] = response.get("web_sources", [])
+                    metadata["local_sources"] = response.get("local_sources", 0)
+                    metadata["sources"] = response.get("sources", [])
+                    metadata["context_chunks"] = response.get("context_chunks", 0)
+                    metadata["context_length"] = response.get("context_length", 0)
+
+                # Ajouter le message assistant (métadonnées seulement si affichées)
+                assistant_message = {
                     "role": "assistant",
                     "content": response["answer"],
-                    "timestamp": datetime.now().isoformat(),
-                    "metadata": metadata
-                })
+                    "timestamp": now
+                }
+                if want_meta:
+                    assistant_message["metadata"] = metadata
+                st.session_state.messages.append(assistant_message)
 
                 # Affichage des métadonnées selon les paramètres
-                if params["show_sources"] or params["show_search_strategy"] or params["show_processing_time"]:
+                if want_meta:
                     self._display_message_metadata(metadata)
 
         except Exception as e:
@@ -257,7 +291,7 @@ class WebAwareChatInterface:
             st.session_state.messages.append({
                 "role": "assistant",
                 "content": error_msg,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now,
                 "error": str(e)
             })
 
@@ -10,11 +10,20 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+from contextlib import asynccontextmanager
+import asyncio
 import logging
 import sys
 import os
 from datetime import datetime
 
+# Sérialisation JSON rapide si orjson est installé
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultJSONResponse
+
 # Ajouter le répertoire parent au path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -29,20 +38,51 @@ from src.web_search import get_web_search_engine
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Intervalle de sondage de LM Studio (secondes)
+LM_STUDIO_PROBE_INTERVAL = 10
+
+async def probe_lm_studio(app: FastAPI):
+    """Sonde LM Studio périodiquement et met en cache l'état de connexion"""
+    while True:
+        app.state.lm_connected = await llm_client.atest_connection()
+        await asyncio.sleep(LM_STUDIO_PROBE_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'application
+    Lance la sonde LM Studio en tâche de fond et libère les clients HTTP à l'arrêt
+    """
+    # Écrivain unique (la sonde), lecture seule dans les routes: pas de verrou
+    app.state.lm_connected = False
+    probe_task = asyncio.create_task(probe_lm_studio(app)) if llm_client else None
+
+    yield
+
+    if probe_task:
+        probe_task.cancel()
+    if agent:
+        await agent.aclose()
+    if llm_client:
+        await llm_client.aclose()
+
 # Initialisation FastAPI
 app = FastAPI(
     title="Mini Perplexity API",
     description="API de recherche web intelligente avec LLM",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=DefaultJSONResponse,
+    lifespan=lifespan
 )
 
-# Configuration CORS pour le frontend
+# Configuration CORS pour le frontend (origines explicites, preflight mis en cache 24h)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=os.getenv("CORS_ORIGINS", "http://localhost:8080").split(","),
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # Modèles Pydantic
@@ -104,24 +144,29 @@ async def root():
             }
         }
 
+class CachedStaticFiles(StaticFiles):
+    """Fichiers statiques servis avec un cache navigateur longue durée"""
+
+    cache_control = "public, max-age=31536000, immutable"
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
+
 # Servir les fichiers statiques du frontend
+# (répertoire vérifié ici une fois, d'où check_dir=False)
 frontend_dir = os.path.join(parent_dir, "frontend")
 if os.path.exists(frontend_dir):
-    app.mount("/static", StaticFiles(directory=frontend_dir), name="static")
+    app.mount("/static", CachedStaticFiles(directory=frontend_dir, check_dir=False), name="static")
 
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     """
     Vérifier l'état de santé de l'API
-    Teste la connexion à LM Studio
+    État de LM Studio fourni par la sonde périodique
     """
-    lm_studio_ok = False
-    
-    if llm_client:
-        try:
-            lm_studio_ok = llm_client.test_connection()
-        except:
-            pass
+    lm_studio_ok = app.state.lm_connected
     
     return HealthResponse(
         status="healthy" if lm_studio_ok else "degraded",
@@ -151,7 +196,7 @@ async def ask_question(request: AskRequest):
         logger.info(f"📥 Question reçue: '{request.query}'")
         
         # Utiliser l'agent pour répondre
-        response = agent.answer_question(
+        response = await agent.answer_question_async(
             question=request.query,
             max_depth=3
         )
@@ -166,12 +211,15 @@ async def ask_question(request: AskRequest):
             ))
         
         # Compter les sources par type
-        web_count = len([s for s in response.get("web_sources", [])])
+        web_count = len(response.get("web_sources") or ())
         local_count = response.get("local_sources", 0)
         
         logger.info(f"✅ Réponse générée: {len(response.get('answer', ''))} caractères")
         
-        return AskResponse(
+        # Invariant: tous les champs proviennent de l'agent (types maîtrisés)
+        # et les sources sont déjà des instances Source validées ci-dessus,
+        # on peut donc construire la réponse sans revalidation Pydantic.
+        return AskResponse.model_construct(
             answer=response.get("answer", "Aucune réponse générée"),
             sources=sources,
             processing_time=response.get("processing_time", 0),
@@ -197,7 +245,7 @@ async def get_stats():
         stats = agent.get_agent_stats()
         return {
             "agent_stats": stats,
-            "lm_studio_connected": llm_client.test_connection() if llm_client else False
+            "lm_studio_connected": app.state.lm_connected
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -205,6 +253,13 @@ async def get_stats():
 # Point d'entrée
 if __name__ == "__main__":
     import uvicorn
+
+    # uvloop (libuv) si disponible, sinon boucle asyncio standard
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
     
     print("🚀 Lancement Mini Perplexity Backend")
     print("=" * 60)
@@ -218,5 +273,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop=loop,
         log_level="info"
     )
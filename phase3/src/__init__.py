@@ -0,0 +1,2 @@
+# Phase 3: Ask-the-Web Agent
+# Web-aware RAG agent (web search, HTML parsing, LM Studio)
\ No newline at end of file
@@ -4,49 +4,113 @@ Agent Orchestrator pour Phase 3 - Ask-the-Web Agent
 Coordonne les recherches multi-étapes et la synthèse d'informations
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Mapping, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import asyncio
+import functools
 import logging
 import re
-from datetime import datetime
-import json
-import sys
-import os
-
-# Ajouter le répertoire parent au path pour imports
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
+import threading
+import time
 
 # Imports Phase 3
-from src.extended_rag_pipeline import get_extended_rag_pipeline
-from src.web_search import get_web_search_engine
+from .extended_rag_pipeline import get_extended_rag_pipeline
+from .web_search import get_web_search_engine
 
 logger = logging.getLogger(__name__)
 
+# Mots-clés par catégorie: source unique pour les regex et l'automate Aho-Corasick
+_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "web": (
+        "aujourd'hui", "actuellement", "récemment", "dernier", "nouveau",
+        "prix", "coût", "valeur", "statistique", "actualité", "news",
+        "météo", "température", "prévision", "cours", "bourse",
+        "site web", "internet", "online", "disponible"
+    ),
+    "comparison": ("comparer", "comparaison", "vs", "versus", "différence"),
+    "multi_aspect": ("et", "ou", "mais", "ainsi que", "également", "plus", "comment", "pourquoi", "quand", "où"),
+    "temporal": ("aujourd'hui", "hier", "demain", "cette année", "dernier", "prochain", "récemment"),
+    "quantitative": ("prix", "coût", "valeur", "montant", "chiffre", "statistique", "pourcentage")
+}
+
+# Catégories comparées sur des mots entiers ("et" ne doit pas matcher "Internet")
+_WORD_CATEGORIES = frozenset({"multi_aspect"})
+
+# Catégories comptant chacune +2 dans le score de complexité
+_COMPLEXITY_CATEGORIES = ("comparison", "multi_aspect", "temporal", "quantitative")
+
+# Une alternance compilée par catégorie (chemin regex, insensible à la casse)
+def _compile_category(name: str, keywords: Tuple[str, ...]) -> re.Pattern:
+    alternation = "|".join(map(re.escape, keywords))
+    if name in _WORD_CATEGORIES:
+        alternation = rf"\b(?:{alternation})\b"
+    return re.compile(alternation, re.I)
+
+_CATEGORY_PATTERNS: Dict[str, re.Pattern] = {
+    name: _compile_category(name, keywords)
+    for name, keywords in _KEYWORDS.items()
+}
+_WEB_INDICATORS = _CATEGORY_PATTERNS["web"]
+_COMPLEXITY_PATTERNS: Tuple[re.Pattern, ...] = tuple(
+    _CATEGORY_PATTERNS[name] for name in _COMPLEXITY_CATEGORIES
+)
+
+# Automate Aho-Corasick (optionnel): toutes les catégories en une seule passe
+try:
+    import ahocorasick
+
+    def _build_automaton() -> "ahocorasick.Automaton":
+        # Un mot-clé peut appartenir à plusieurs catégories (ex: "prix")
+        categories_by_keyword: Dict[str, set] = {}
+        for name, keywords in _KEYWORDS.items():
+            for keyword in keywords:
+                categories_by_keyword.setdefault(keyword, set()).add(name)
+
+        # Valeur: (longueur du mot-clé, catégories) pour vérifier les limites de mot
+        automaton = ahocorasick.Automaton()
+        for keyword, names in categories_by_keyword.items():
+            automaton.add_word(keyword, (len(keyword), frozenset(names)))
+        automaton.make_automaton()
+        return automaton
+
+    _AUTOMATON = _build_automaton()
+except ImportError:
+    _AUTOMATON = None
+
+# Connecteurs logiques utilisés pour décomposer les questions longues
+_SPLIT_CONNECTORS = re.compile(r'(?:et|ou|mais|ainsi que|également)')
+
 class SearchPlanner:
     """
     Planificateur de recherches pour questions complexes
     """
 
     def __init__(self):
-        self.complexity_patterns = {
-            "comparison": re.compile(r"(comparer|comparaison|vs|versus|différence)", re.I),
-            "multi_aspect": re.compile(r"(et|ainsi que|également|plus|comment|pourquoi|quand|où)", re.I),
-            "temporal": re.compile(r"(aujourd'hui|hier|demain|cette année|dernier|prochain|récemment)", re.I),
-            "quantitative": re.compile(r"(prix|coût|valeur|montant|chiffre|statistique|pourcentage)", re.I)
-        }
+        # Alias vers les patterns partagés (utilisé par les statistiques)
+        self.complexity_patterns = _COMPLEXITY_PATTERNS
 
-    def analyze_question(self, question: str) -> Dict[str, Any]:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def analyze_question(question: str) -> MappingProxyType:
         """
         Analyse la question pour déterminer la stratégie de recherche
+        Mémoïsée par question: le résultat est partagé, donc immuable
 
         Returns:
-            Dictionnaire avec analyse et plan
+            Vue en lecture seule avec analyse et plan
         """
+        # Nombre de mots calculé une seule fois pour toute l'analyse
+        n_tokens = len(question.split())
+
+        # Une seule passe sur la question si l'automate est disponible
+        categories = SearchPlanner._match_categories(question)
+
         analysis = {
-            "needs_web": self._needs_web_search(question),
-            "complexity": self._assess_complexity(question),
-            "sub_questions": self._break_down_question(question),
+            "needs_web": SearchPlanner._needs_web_search(question, categories),
+            "complexity": SearchPlanner._assess_complexity(question, n_tokens, categories),
+            "sub_questions": tuple(SearchPlanner._break_down_question(question, n_tokens)),
             "search_strategy": "single",  # single, sequential, parallel
             "estimated_searches": 1
         }
@@ -59,67 +123,109 @@ class SearchPlanner:
                 analysis["search_strategy"] = "parallel"
             analysis["estimated_searches"] = len(analysis["sub_questions"])
 
-        logger.info(f"Analyse question: stratégie={analysis['search_strategy']}, "
-                   f"recherches={analysis['estimated_searches']}")
+        logger.info("Analyse question: stratégie=%s, recherches=%d",
+                    analysis["search_strategy"], analysis["estimated_searches"])
 
-        return analysis
+        return MappingProxyType(analysis)
 
-    def _needs_web_search(self, question: str) -> bool:
-        """Détermine si la question nécessite une recherche web"""
+    @staticmethod
+    def _match_categories(question: str) -> Optional[frozenset]:
+        """
+        Catégories de mots-clés présentes dans la question (une passe Aho-Corasick)
+        Retourne None si pyahocorasick n'est pas installé (chemin regex)
+        """
+        if _AUTOMATON is None:
+            return None
+
+        text = question.lower()
+        matched = set()
+        for end, (length, names) in _AUTOMATON.iter(text):
+            if names & _WORD_CATEGORIES and not SearchPlanner._is_whole_word(text, end - length + 1, end + 1):
+                names = names - _WORD_CATEGORIES
+            matched |= names
+        return frozenset(matched)
+
+    @staticmethod
+    def _is_whole_word(text: str, start: int, end: int) -> bool:
+        """Équivalent de \\b...\\b pour une occurrence text[start:end]"""
+        def is_word_char(c: str) -> bool:
+            return c.isalnum() or c == '_'
+        return ((start == 0 or not is_word_char(text[start - 1]))
+                and (end == len(text) or not is_word_char(text[end])))
+
+    @staticmethod
+    def _has_category(question: str, categories: Optional[frozenset], name: str) -> bool:
+        """
+        Présence d'une catégorie de mots-clés dans la question
+        Utilise l'ensemble pré-calculé par l'automate, sinon la regex
+        insensible à la casse (aucune copie en minuscules de la question)
+        """
+        if categories is not None:
+            return name in categories
+        return _CATEGORY_PATTERNS[name].search(question) is not None
 
-        # Mots-clés indiquant une recherche web
-        web_indicators = [
-            "aujourd'hui", "actuellement", "récemment", "dernier", "nouveau",
-            "prix", "coût", "valeur", "statistique", "actualité", "news",
-            "météo", "température", "prévision", "cours", "bourse",
-            "site web", "internet", "online", "disponible"
-        ]
+    @staticmethod
+    def _needs_web_search(question: str, categories: Optional[frozenset] = None) -> bool:
+        """Détermine si la question nécessite une recherche web"""
+        return SearchPlanner._has_category(question, categories, "web")
 
-        question_lower = question.lower()
-        return any(indicator in question_lower for indicator in web_indicators)
+    @staticmethod
+    def _assess_complexity(question: str, n_tokens: int, categories: Optional[frozenset] = None) -> int:
+        """
+        Évalue la complexité de la question (0-10)
 
-    def _assess_complexity(self, question: str) -> int:
-        """Évalue la complexité de la question (0-10)"""
+        Args:
+            categories: Catégories déjà détectées par l'automate, ou None
+                pour évaluer les regex de complexité
+        """
 
         complexity = 0
 
         # Longueur de la question
-        if len(question.split()) > 15:
+        if n_tokens > 15:
             complexity += 2
 
         # Patterns de complexité
-        for pattern_name, pattern in self.complexity_patterns.items():
-            if pattern.search(question):
+        for name in _COMPLEXITY_CATEGORIES:
+            if SearchPlanner._has_category(question, categories, name):
                 complexity += 2
+                # Plafond atteint: inutile d'évaluer les patterns restants
+                if complexity >= 10:
+                    return 10
 
-        # Questions multiples
-        if question.count('?') > 1 or any(word in question.lower() for word in ['et', 'ou', 'mais']):
+        # Questions multiples (les connecteurs et/ou/mais sont comptés dans multi_aspect)
+        if question.count('?') > 1:
             complexity += 3
 
         return min(10, complexity)
 
-    def _break_down_question(self, question: str) -> List[str]:
+    @staticmethod
+    def _break_down_question(question: str, n_tokens: int) -> List[str]:
         """Décompose la question en sous-questions si nécessaire"""
 
-        # Pour l'instant, logique simple
-        sub_questions = [question]
+        # Question courte (cas courant): pas de décomposition
+        if n_tokens <= 20:
+            return [question]
 
-        # Si question très longue, essayer de diviser
-        if len(question.split()) > 20:
-            # Diviser par les connecteurs logiques
-            parts = re.split(r'(?:et|ou|mais|ainsi que|également)', question)
-            if len(parts) > 1:
-                sub_questions = [part.strip() + '?' for part in parts if part.strip()]
+        # Question très longue: diviser par les connecteurs logiques
+        parts = _SPLIT_CONNECTORS.split(question)
+        if len(parts) > 1:
+            return [part.strip() + '?' for part in parts if part.strip()]
 
-        return sub_questions
+        return [question]
 
 class WebAwareAgent:
     """
     Agent intelligent capable de recherches web multi-étapes
     """
 
-    def __init__(self):
+    def __init__(self, max_parallel: int = 4):
+        """
+        Args:
+            max_parallel: Nombre maximum de sous-recherches simultanées
+        """
         self.planner = SearchPlanner()
+        self.max_parallel = max_parallel
         
         # Vérifier disponibilité des composants
         try:
@@ -127,7 +233,7 @@ class WebAwareAgent:
             self.web_search = get_web_search_engine()
             self.available = True
         except Exception as e:
-            logger.error(f"Erreur initialisation agent: {e}")
+            logger.error("Erreur initialisation agent: %s", e)
             self.rag_pipeline = None
             self.web_search = None
             self.available = False
@@ -140,11 +246,13 @@ class WebAwareAgent:
             "average_response_time": 0
         }
 
-        logger.info(f"WebAwareAgent initialisé (available={self.available})")
+        logger.info("WebAwareAgent initialisé (available=%s)", self.available)
 
     def answer_question(self, question: str, max_depth: int = 3) -> Dict[str, Any]:
         """
         Répond à une question en utilisant l'orchestration intelligente
+        API synchrone: chaque appel tourne dans sa propre boucle d'événements, dans
+        un thread dédié si le thread appelant a déjà une boucle active (ex: notebook)
 
         Args:
             question: Question de l'utilisateur
@@ -153,17 +261,48 @@ class WebAwareAgent:
         Returns:
             Réponse complète avec métadonnées
         """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._answer_question_in_own_loop(question, max_depth))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(
+                asyncio.run, self._answer_question_in_own_loop(question, max_depth)
+            ).result()
 
-        start_time = datetime.now()
+    async def _answer_question_in_own_loop(self, question: str, max_depth: int) -> Dict[str, Any]:
+        """answer_question_async dans une boucle créée pour l'appel (asyncio.run)"""
+        try:
+            return await self.answer_question_async(question, max_depth)
+        finally:
+            # Client HTTP/2 LM Studio lié à cette boucle: fermé avant qu'elle ne se termine
+            if self.rag_pipeline is not None:
+                await self.rag_pipeline.aclose()
+
+    async def answer_question_async(self, question: str, max_depth: int = 3) -> Dict[str, Any]:
+        """
+        Version asynchrone de answer_question
+        Les sous-questions indépendantes sont recherchées en concurrence
+
+        Args:
+            question: Question de l'utilisateur
+            max_depth: Profondeur maximale de recherche
+
+        Returns:
+            Réponse complète avec métadonnées
+        """
+
+        start_ns = time.monotonic_ns()
         self.stats["total_questions"] += 1
 
-        logger.info(f"🤖 Traitement question: '{question}'")
+        logger.info("🤖 Traitement question: '%s'", question)
 
         try:
             if not self.available:
                 return {
                     "answer": "Le système de recherche web n'est pas disponible actuellement. Veuillez vérifier que tous les composants sont installés.",
-                    "processing_time": (datetime.now() - start_time).total_seconds(),
+                    "processing_time": (time.monotonic_ns() - start_ns) / 1e9,
                     "search_strategy": "unavailable"
                 }
 
@@ -172,19 +311,19 @@ class WebAwareAgent:
 
             # 2. Exécution selon la stratégie
             if analysis["search_strategy"] == "single":
-                response = self._execute_single_search(question, analysis)
+                response = await self._execute_single_search_async(question, analysis)
 
             elif analysis["search_strategy"] == "parallel":
-                response = self._execute_parallel_search(analysis["sub_questions"], analysis)
+                response = await self._execute_parallel_search(analysis["sub_questions"], analysis)
 
             elif analysis["search_strategy"] == "sequential":
-                response = self._execute_sequential_search(analysis["sub_questions"], analysis, max_depth)
+                response = await self._execute_sequential_search(analysis["sub_questions"], analysis, max_depth)
 
             else:
-                response = self._execute_single_search(question, analysis)
+                response = await self._execute_single_search_async(question, analysis)
 
             # 3. Métriques finales
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = (time.monotonic_ns() - start_ns) / 1e9
             response["processing_time"] = processing_time
             response["search_strategy"] = analysis["search_strategy"]
             response["sub_questions_count"] = len(analysis["sub_questions"])
@@ -199,47 +338,68 @@ class WebAwareAgent:
                 processing_time
             ) / self.stats["total_questions"]
 
-            logger.info(f"✅ Réponse générée: {len(response.get('answer', ''))} caractères, "
-                       f"stratégie={analysis['search_strategy']}, temps={processing_time:.2f}s")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✅ Réponse générée: %d caractères, stratégie=%s, temps=%.2fs",
+                            len(response.get('answer', '')), analysis["search_strategy"], processing_time)
 
             return response
 
         except Exception as e:
-            logger.error(f"❌ Erreur agent: {e}")
+            logger.error("❌ Erreur agent: %s", e)
             return {
                 "answer": "Désolé, une erreur s'est produite lors du traitement de votre question.",
                 "error": str(e),
-                "processing_time": (datetime.now() - start_time).total_seconds(),
+                "processing_time": (time.monotonic_ns() - start_ns) / 1e9,
                 "search_strategy": "error"
             }
 
-    def _execute_single_search(self, question: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_single_search_async(self, question: str, analysis: Mapping[str, Any]) -> Dict[str, Any]:
         """Exécution d'une recherche simple"""
 
         use_web = analysis.get("needs_web", True)
-        return self.rag_pipeline.ask_question(question, use_web=use_web)
+        return await self.rag_pipeline.ask_question_async(question, use_web=use_web)
 
-    def _execute_parallel_search(self, sub_questions: List[str], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_parallel_search(self, sub_questions: List[str], analysis: Mapping[str, Any]) -> Dict[str, Any]:
         """Exécution de recherches en parallèle"""
 
-        logger.info(f"🔀 Recherche parallèle: {len(sub_questions)} sous-questions")
+        logger.info("🔀 Recherche parallèle: %d sous-questions", len(sub_questions))
+
+        # Sémaphore créé par appel: lié à la boucle d'événements courante
+        semaphore = asyncio.Semaphore(self.max_parallel)
 
-        # Effectuer les recherches en parallèle (simulation)
-        sub_responses = []
-        all_web_sources = []
+        async def bounded_search(sub_q: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._execute_single_search_async(sub_q, analysis)
+
+        # Une seule recherche par sous-question distincte (ordre préservé)
+        unique_questions = list(dict.fromkeys(sub_questions))
+
+        # Lancer toutes les sous-recherches en concurrence
+        tasks = [asyncio.create_task(bounded_search(sub_q)) for sub_q in unique_questions]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results_by_question = dict(zip(unique_questions, results))
+
+        sub_responses = [None] * len(sub_questions)
+        web_seen = {}  # URL → None, déduplication ordonnée
         all_local_sources = 0
 
-        for sub_q in sub_questions:
-            response = self._execute_single_search(sub_q, analysis)
-            sub_responses.append({
+        for i, sub_q in enumerate(sub_questions):
+            response = results_by_question[sub_q]
+            if isinstance(response, Exception):
+                logger.warning("Échec sous-question '%s': %s", sub_q, response)
+                response = {}
+
+            # Tuple vide partagé comme défaut: pas de liste allouée pour une clé absente
+            sub_responses[i] = {
                 "question": sub_q,
                 "answer": response.get("answer", ""),
-                "sources": response.get("sources", [])
-            })
+                "sources": response.get("sources") or ()
+            }
 
             # Collecter les sources
-            all_web_sources.extend(response.get("web_sources", []))
-            all_local_sources += response.get("local_sources", 0)
+            if web_sources := response.get("web_sources"):
+                web_seen.update(dict.fromkeys(web_sources))
+            all_local_sources += response.get("local_sources") or 0
 
         # Synthèse des réponses
         combined_answer = self._synthesize_responses(sub_questions, sub_responses)
@@ -247,17 +407,18 @@ class WebAwareAgent:
         return {
             "answer": combined_answer,
             "sources": self._merge_sources(sub_responses),
-            "web_sources": list(set(all_web_sources)),
+            "web_sources": list(web_seen),
             "local_sources": all_local_sources,
             "sub_responses": sub_responses
         }
 
-    def _execute_sequential_search(self, sub_questions: List[str], analysis: Dict[str, Any], max_depth: int) -> Dict[str, Any]:
+    async def _execute_sequential_search(self, sub_questions: List[str], analysis: Mapping[str, Any], max_depth: int) -> Dict[str, Any]:
         """Exécution de recherches séquentielles avec raffinement"""
 
-        logger.info(f"🔗 Recherche séquentielle: {len(sub_questions)} étapes")
+        logger.info("🔗 Recherche séquentielle: %d étapes", len(sub_questions))
 
-        current_context = ""
+        # Derniers extraits de réponses (borné: pas de concaténation quadratique)
+        context_snippets = deque(maxlen=3)
         all_responses = []
 
         for i, sub_q in enumerate(sub_questions):
@@ -266,10 +427,10 @@ class WebAwareAgent:
 
             # Enrichir la question avec le contexte précédent
             enriched_question = sub_q
-            if current_context:
-                enriched_question = f"{sub_q} (Contexte: {current_context[:200]}...)"
+            if context_snippets:
+                enriched_question = f"{sub_q} (Contexte: {' '.join(context_snippets)}...)"
 
-            response = self._execute_single_search(enriched_question, analysis)
+            response = await self._execute_single_search_async(enriched_question, analysis)
             all_responses.append({
                 "step": i + 1,
                 "question": sub_q,
@@ -279,7 +440,7 @@ class WebAwareAgent:
             })
 
             # Mettre à jour le contexte pour l'étape suivante
-            current_context += f" {response.get('answer', '')}"
+            context_snippets.append(response.get('answer', '')[:200])
 
         # Synthèse finale
         final_answer = self._synthesize_sequential_responses(sub_questions, all_responses)
@@ -293,52 +454,58 @@ class WebAwareAgent:
     def _synthesize_responses(self, sub_questions: List[str], sub_responses: List[Dict[str, Any]]) -> str:
         """Synthèse des réponses parallèles"""
 
-        # Construction d'une réponse cohérente
-        synthesis_parts = []
-
-        synthesis_parts.append("Voici une synthèse des informations trouvées:")
-
-        for i, resp in enumerate(sub_responses):
-            question = resp["question"]
-            answer = resp["answer"][:300] + "..." if len(resp["answer"]) > 300 else resp["answer"]
-
-            synthesis_parts.append(f"\n**{question}**\n{answer}")
-
-        synthesis_parts.append("\nCette réponse combine des informations provenant de sources multiples.")
+        # Construction d'une réponse cohérente en une seule jointure
+        body = "\n".join(
+            f"\n**{resp['question']}**\n{self._truncate(resp['answer'], 300)}"
+            for resp in sub_responses
+        )
 
-        return "\n".join(synthesis_parts)
+        return (
+            f"Voici une synthèse des informations trouvées:\n{body}\n"
+            "\nCette réponse combine des informations provenant de sources multiples."
+        )
 
     def _synthesize_sequential_responses(self, sub_questions: List[str], step_responses: List[Dict[str, Any]]) -> str:
         """Synthèse des réponses séquentielles"""
 
-        synthesis_parts = ["Voici le résultat de l'analyse étape par étape:"]
+        body = "\n".join(
+            f"\n### Étape {resp['step']}: {resp['question']}\n{resp['answer']}"
+            for resp in step_responses
+        )
 
-        for resp in step_responses:
-            step = resp["step"]
-            question = resp["question"]
-            answer = resp["answer"]
+        return (
+            f"Voici le résultat de l'analyse étape par étape:\n{body}\n"
+            "\n**Conclusion:** Cette analyse progressive permet d'approfondir le sujet."
+        )
 
-            synthesis_parts.append(f"\n### Étape {step}: {question}")
-            synthesis_parts.append(answer)
-
-        synthesis_parts.append("\n**Conclusion:** Cette analyse progressive permet d'approfondir le sujet.")
-
-        return "\n".join(synthesis_parts)
+    @staticmethod
+    def _truncate(text: str, limit: int) -> str:
+        """Tronque le texte à `limit` caractères (slice uniquement si nécessaire)"""
+        return text[:limit] + "..." if len(text) > limit else text
 
     def _merge_sources(self, responses: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         """Fusion des sources de toutes les réponses"""
 
-        all_sources = []
-        seen_urls = set()
+        # Dictionnaire indexé par URL: déduplication en conservant l'ordre d'insertion
+        merged = {}
 
         for resp in responses:
-            for source in resp.get("sources", []):
-                url = source.get("url", "")
-                if url and url not in seen_urls:
-                    all_sources.append(source)
-                    seen_urls.add(url)
+            for source in resp.get("sources", ()):
+                url = source.get("url")
+                if url and url not in merged:
+                    merged[url] = source
+
+        return list(merged.values())
 
-        return all_sources
+    async def aclose(self):
+        """
+        Libère les clients HTTP partagés par les composants (pipeline, recherche web)
+        Une seule session par composant pour toutes les sous-recherches: à appeler à l'arrêt
+        """
+        for component in (self.rag_pipeline, self.web_search):
+            close = getattr(component, "aclose", None)
+            if close is not None:
+                await close()
 
     def get_agent_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques de l'agent"""
@@ -347,20 +514,26 @@ class WebAwareAgent:
             "planner_complexity_patterns": len(self.planner.complexity_patterns)
         }
 
-# Instance globale
-web_aware_agent = WebAwareAgent()
+# Instance globale (créée au premier appel, pas à l'import)
+_agent_lock = threading.Lock()
+_agent_singleton: Optional[WebAwareAgent] = None
 
 def get_web_aware_agent() -> WebAwareAgent:
     """Factory function pour l'instance globale"""
-    return web_aware_agent
-
-# Tests unitaires
+    global _agent_singleton
+    if _agent_singleton is None:
+        with _agent_lock:
+            if _agent_singleton is None:
+                _agent_singleton = WebAwareAgent()
+    return _agent_singleton
+
+# Tests unitaires (depuis phase3/: python -m src.agent_orchestrator)
 if __name__ == "__main__":
     print("🧪 Test de l'Agent Orchestrator")
     print("=" * 50)
 
     # Initialisation
-    agent = WebAwareAgent()
+    agent = get_web_aware_agent()
 
     # Tests avec différentes questions
     test_questions = [
@@ -4,8 +4,19 @@ Pipeline RAG Étendu - Phase 3
 Combine connaissances locales et web pour créer un agent web-aware
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Sequence
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain, islice
+import asyncio
+import bisect
+import functools
+import hashlib
+import heapq
 import logging
+import threading
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import json
 import sys
@@ -25,102 +36,276 @@ sys.path.insert(0, grandparent_dir)
 # Imports Phase 2 (existants) - optionnels si Qdrant non disponible
 try:
     from phase2.src.rag_pipeline import get_rag_pipeline
-    from phase2.src.embeddings import EmbeddingManager
     from phase2.src.vector_db import VectorDatabase
     PHASE2_AVAILABLE = True
 except Exception as e:
-    logger.warning(f"Phase 2 components not available: {e}")
+    logger.warning("Phase 2 components not available: %s", e)
     PHASE2_AVAILABLE = False
     get_rag_pipeline = None
-    EmbeddingManager = None
     VectorDatabase = None
 
+# NumPy (optionnel) pour le scoring vectorisé des grands ensembles de résultats
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# xxHash (optionnel) pour des identifiants de chunks stables entre processus
+try:
+    import xxhash
+
+    def _text_fingerprint(text: str) -> int:
+        return xxhash.xxh3_64_intdigest(text.encode("utf-8", "ignore"))
+except ImportError:
+    def _text_fingerprint(text: str) -> int:
+        return int.from_bytes(hashlib.blake2b(text.encode("utf-8", "ignore"), digest_size=8).digest(), "big")
+
 # Imports Phase 3 (nouveaux)
 from src.web_search import get_web_search_engine
 from src.html_parser import get_web_processor
 
 
+@dataclass(slots=True)
+class Interaction:
+    """Interaction mémorisée (slots: pas de __dict__ par entrée, accès par attribut)"""
+    timestamp: datetime
+    question: str
+    response: Dict[str, Any]
+    search_queries: List[str] = field(default_factory=list)
+    web_sources: List[str] = field(default_factory=list)
+    tokens: frozenset = frozenset()  # Mots de la question
+    query_tokens: List[frozenset] = field(default_factory=list)  # Mots de chaque requête
+
 class ConversationMemory:
     """
     Gestionnaire de mémoire conversationnelle pour l'agent web-aware
     """
 
-    def __init__(self, max_memory: int = 10, ttl_hours: int = 24):
+    def __init__(self, max_memory: int = 10, ttl_hours: int = 24,
+                 cache_size: int = 128, cache_ttl_seconds: int = 3600):
         """
         Args:
             max_memory: Nombre maximum d'interactions en mémoire
             ttl_hours: Durée de vie des interactions (heures)
+            cache_size: Nombre maximum de réponses en cache (LRU)
+            cache_ttl_seconds: Durée de vie d'une réponse en cache (secondes)
         """
         self.max_memory = max_memory
         self.ttl_hours = ttl_hours
-        self.interactions = []
-        self.search_cache = {}  # Cache des recherches récentes
+        # File bornée: les plus anciennes interactions sont évincées en O(1)
+        self.interactions = deque(maxlen=max_memory)
+        # ask_question tourne dans plusieurs threads: ajouts et lectures de la file
+        # sous verrou (une deque modifiée pendant un parcours lève RuntimeError)
+        self._interactions_lock = threading.Lock()
 
-        logger.info(f"ConversationMemory initialisé: max={max_memory}, ttl={ttl_hours}h")
+        # Cache des réponses récentes: clé canonique → (expiration monotone, réponse)
+        self.search_cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._cache_lock = threading.Lock()  # ask_question peut tourner dans plusieurs threads
 
-    def add_interaction(self, question: str, response: Dict[str, Any]):
-        """Ajouter une interaction à la mémoire"""
+        logger.info("ConversationMemory initialisé: max=%s, ttl=%sh", max_memory, ttl_hours)
 
-        interaction = {
-            "timestamp": datetime.now(),
-            "question": question,
-            "response": response,
-            "search_queries": response.get("search_queries", []),
-            "web_sources": response.get("web_sources", [])
-        }
+    def add_interaction(self, question: str, response: Dict[str, Any], now: Optional[datetime] = None):
+        """
+        Ajouter une interaction à la mémoire
+
+        Args:
+            now: Horodatage déjà lu par l'appelant (évite une nouvelle lecture de l'horloge)
+        """
+        now = now or datetime.now()
+
+        search_queries = response.get("search_queries", [])
+
+        interaction = Interaction(
+            timestamp=now,
+            question=question,
+            response=response,
+            search_queries=search_queries,
+            web_sources=response.get("web_sources", []),
+            # Tokens pré-calculés une fois pour les comparaisons de similarité
+            tokens=frozenset(question.lower().split()),
+            query_tokens=[frozenset(q.lower().split()) for q in search_queries]
+        )
 
-        self.interactions.append(interaction)
+        with self._interactions_lock:
+            self.interactions.append(interaction)
 
-        # Limiter la taille
-        if len(self.interactions) > self.max_memory:
-            self.interactions.pop(0)
+            # Nettoyer les anciennes interactions
+            self._cleanup_expired(now)
+
+    @staticmethod
+    def cache_key(question: str, *params: Any) -> str:
+        """
+        Clé canonique d'une question: mots en minuscules triés (ordre et casse ignorés)
+        Les paramètres de recherche font partie de la clé
+        """
+        canonical = " ".join(sorted(question.lower().split()))
+        canonical = "|".join([canonical, *map(str, params)])
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_cached_response(self, key: str) -> Optional[Dict[str, Any]]:
+        """Réponse en cache encore valide pour cette clé, ou None"""
+        with self._cache_lock:
+            entry = self.search_cache.get(key)
+            if entry is None:
+                return None
+
+            expires_at, response = entry
+            if time.monotonic() >= expires_at:
+                del self.search_cache[key]
+                return None
+
+            self.search_cache.move_to_end(key)
+            return response
+
+    def cache_response(self, key: str, response: Dict[str, Any]):
+        """Mettre une réponse en cache (éviction LRU au-delà de cache_size)"""
+        with self._cache_lock:
+            self.search_cache[key] = (time.monotonic() + self.cache_ttl_seconds, response)
+            self.search_cache.move_to_end(key)
+            while len(self.search_cache) > self.cache_size:
+                self.search_cache.popitem(last=False)
+
+    def _first_after(self, interactions: Sequence[Interaction], cutoff: datetime) -> int:
+        """
+        Index de la première interaction postérieure à cutoff
+        Les interactions sont ajoutées dans l'ordre chronologique: recherche
+        dichotomique O(log N) au lieu d'un parcours complet
+        """
+        return bisect.bisect_right(interactions, cutoff, key=lambda i: i.timestamp)
 
-        # Nettoyer les anciennes interactions
-        self._cleanup_expired()
+    def _interactions_since(self, cutoff: datetime) -> List[Interaction]:
+        """
+        Interactions postérieures à cutoff
+        Copie de la file prise sous verrou (au plus max_memory éléments): les threads
+        concurrents peuvent ajouter des interactions pendant le parcours
+        """
+        with self._interactions_lock:
+            interactions = list(self.interactions)
+        return interactions[self._first_after(interactions, cutoff):]
 
-    def get_recent_context(self, hours: int = 1) -> List[Dict[str, Any]]:
+    def get_recent_context(self, hours: int = 1) -> List[Interaction]:
         """Récupérer le contexte récent"""
         cutoff = datetime.now() - timedelta(hours=hours)
 
-        recent = [i for i in self.interactions if i["timestamp"] > cutoff]
-        return recent[-5:]  # Dernières 5 interactions
+        return self._interactions_since(cutoff)[-5:]  # Dernières 5 interactions
 
     def is_recently_searched(self, query: str, hours: int = 1) -> bool:
         """Vérifier si une recherche similaire a été faite récemment"""
         cutoff = datetime.now() - timedelta(hours=hours)
+        query_tokens = frozenset(query.lower().split())
 
-        for interaction in self.interactions:
-            if interaction["timestamp"] > cutoff:
-                if any(self._similar_queries(query, q) for q in interaction["search_queries"]):
-                    return True
+        for interaction in self._interactions_since(cutoff):
+            if any(self._similar_queries(query_tokens, q) for q in interaction.query_tokens):
+                return True
 
         return False
 
-    def _similar_queries(self, query1: str, query2: str) -> bool:
-        """Vérifier similarité basique entre requêtes"""
-        words1 = set(query1.lower().split())
-        words2 = set(query2.lower().split())
+    @staticmethod
+    def _similar_queries(words1: frozenset, words2: frozenset) -> bool:
+        """Vérifier similarité basique entre requêtes (ensembles de mots pré-calculés)"""
+        small, big = (words1, words2) if len(words1) <= len(words2) else (words2, words1)
 
-        # Intersection > 70%
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        # Jaccard <= |petit| / |grand|: inutile de calculer l'intersection
+        if not big or len(small) <= 0.7 * len(big):
+            return False
 
-        return len(intersection) / len(union) > 0.7 if union else False
+        # Intersection > 70%
+        intersection = sum(1 for word in small if word in big)
+        return intersection / (len(small) + len(big) - intersection) > 0.7
+
+    def _cleanup_expired(self, now: Optional[datetime] = None):
+        """Nettoyer les interactions expirées (verrou des interactions déjà acquis)"""
+        cutoff = (now or datetime.now()) - timedelta(hours=self.ttl_hours)
+
+        interactions = self.interactions
+        expired = self._first_after(interactions, cutoff)
+        if expired:
+            # Nouvelle file (remplacement atomique pour les lectures concurrentes)
+            self.interactions = deque(
+                islice(interactions, expired, None),
+                maxlen=self.max_memory
+            )
 
-    def _cleanup_expired(self):
-        """Nettoyer les interactions expirées"""
-        cutoff = datetime.now() - timedelta(hours=self.ttl_hours)
+class SemanticCache:
+    """
+    Cache sémantique des réponses: une question proche (similarité cosinus)
+    d'une question déjà traitée réutilise sa réponse
+    Embeddings normalisés stockés dans un tampon circulaire NumPy
+    """
 
-        self.interactions = [
-            i for i in self.interactions
-            if i["timestamp"] > cutoff
-        ]
+    def __init__(self, max_entries: int = 256, threshold: float = 0.92, ttl_seconds: int = 3600):
+        """
+        Args:
+            max_entries: Nombre maximum de réponses (les plus anciennes sont remplacées)
+            threshold: Similarité cosinus minimale pour réutiliser une réponse
+            ttl_seconds: Durée de vie d'une réponse en cache (secondes)
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        self.embeddings = None  # (max_entries, dimension), alloué au premier ajout
+        self.entries: List[Optional[tuple]] = [None] * max_entries  # (expiration, params, réponse)
+        self.size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, embedding: "np.ndarray", params: tuple) -> Optional[Dict[str, Any]]:
+        """Réponse de la question la plus proche si assez similaire, encore valide et mêmes paramètres"""
+        with self._lock:
+            if not self.size:
+                return None
+
+            # Un seul produit matrice-vecteur: embeddings normalisés → similarité cosinus
+            similarities = self.embeddings[:self.size] @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+
+            expires_at, entry_params, response = self.entries[best]
+            if entry_params != params or time.monotonic() >= expires_at:
+                return None
+            return response
+
+    def add(self, embedding: "np.ndarray", params: tuple, response: Dict[str, Any]):
+        """Ajouter une réponse (remplace la plus ancienne si le tampon est plein)"""
+        with self._lock:
+            if self.embeddings is None:
+                self.embeddings = np.zeros((self.max_entries, embedding.shape[0]), dtype=np.float32)
+
+            self.embeddings[self._next] = embedding
+            self.entries[self._next] = (time.monotonic() + self.ttl_seconds, params, response)
+            self._next = (self._next + 1) % self.max_entries
+            self.size = min(self.size + 1, self.max_entries)
+
+    def __len__(self) -> int:
+        return self.size
 
 class ExtendedRAGPipeline:
     """
     Pipeline RAG étendu combinant connaissances locales et web
     """
 
+    # Téléchargements + parsing HTML simultanés (I/O réseau, libère le GIL)
+    MAX_FETCH_WORKERS = 8
+
+    # Au-delà de ce nombre de résultats, le scoring est vectorisé avec NumPy
+    VECTORIZE_THRESHOLD = 32
+
+    # Durée (secondes) pendant laquelle l'état de connexion LM Studio est réutilisé
+    LLM_HEALTH_TTL = 30
+
+    # Collection Qdrant des chunks web indexés temporairement
+    WEB_COLLECTION = "web_chunks"
+
+    # Durée de conservation des chunks web indexés et intervalle entre deux nettoyages (secondes)
+    WEB_CHUNK_TTL = 24 * 3600
+    WEB_CLEANUP_INTERVAL = 600
+
     def __init__(self):
         """Initialisation du pipeline étendu"""
 
@@ -128,12 +313,14 @@ class ExtendedRAGPipeline:
         if PHASE2_AVAILABLE:
             try:
                 self.local_rag = get_rag_pipeline()
-                self.embedding_manager = EmbeddingManager()
+                # Modèle déjà chargé par la recherche locale: partagé pour n'encoder
+                # chaque question qu'une seule fois (cache sémantique + recherche locale)
+                self.embedding_manager = self.local_rag.similarity_search.embedding_manager
                 self.vector_db = VectorDatabase()
                 self.local_available = True
                 logger.info("Composants Phase 2 chargés avec succès")
             except Exception as e:
-                logger.warning(f"Composants Phase 2 non disponibles: {e}")
+                logger.warning("Composants Phase 2 non disponibles: %s", e)
                 self.local_rag = None
                 self.embedding_manager = None
                 self.vector_db = None
@@ -150,15 +337,37 @@ class ExtendedRAGPipeline:
         self.web_processor = get_web_processor()
         self.memory = ConversationMemory()
 
-        # Statistiques
+        # Cache sémantique: nécessite le modèle d'embeddings (Phase 2) et NumPy
+        self.semantic_cache = SemanticCache() if self.local_available and NUMPY_AVAILABLE else None
+
+        # Collection web créée à la première indexation
+        self._web_collection_ready = False
+        self._web_collection_lock = threading.Lock()
+        # Empreinte des chunks indexés → expiration (un chunk déjà indexé n'est pas ré-encodé)
+        self._indexed_fingerprints: Dict[int, float] = {}
+        self._web_cleanup_due = 0.0
+
+        # Client LM Studio importé au premier usage, connexion re-testée au plus toutes les LLM_HEALTH_TTL s
+        self._llm_client = None
+        self._llm_client_ok = False
+        self._llm_checked_until = 0.0
+
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=self.MAX_FETCH_WORKERS,
+            thread_name_prefix="web-fetch"
+        )
+
+        # Statistiques (incrémentées depuis plusieurs threads: sous verrou)
         self.stats = {
             "total_queries": 0,
             "web_searches": 0,
             "local_searches": 0,
-            "cache_hits": 0
+            "cache_hits": 0,
+            "semantic_cache_hits": 0
         }
+        self._stats_lock = threading.Lock()
 
-        logger.info(f"ExtendedRAGPipeline initialisé (local_available={self.local_available})")
+        logger.info("ExtendedRAGPipeline initialisé (local_available=%s)", self.local_available)
 
     def ask_question(self, question: str, use_web: bool = True, max_web_results: int = 3) -> Dict[str, Any]:
         """
@@ -173,71 +382,186 @@ class ExtendedRAGPipeline:
             Réponse complète avec métadonnées
         """
 
-        self.stats["total_queries"] += 1
+        self._increment_stat("total_queries")
         start_time = datetime.now()
 
-        logger.info(f"Traitement question: '{question}' (web={use_web})")
+        logger.info("Traitement question: '%s' (web=%s)", question, use_web)
+
+        # 0. Réponse en cache (question identique ou sémantiquement proche)
+        cache_key, question_embedding, cached = self._lookup_cached(question, use_web, max_web_results)
+        if cached is not None:
+            return {**cached, "processing_time": (datetime.now() - start_time).total_seconds()}
 
         try:
-            # 1. Recherche locale (toujours effectuée)
-            local_results = self._search_local(question)
-            self.stats["local_searches"] += 1
-
-            # 2. Recherche web (si activée et pas en cache)
-            web_results = []
-            search_queries = []
-
-            if use_web:
-                if not self.memory.is_recently_searched(question):
-                    web_results, queries = self._search_web_enhanced(question, max_web_results)
-                    search_queries = queries
-                    self.stats["web_searches"] += 1
-                else:
-                    self.stats["cache_hits"] += 1
-                    logger.info("Utilisation du cache pour éviter recherche répétée")
-
-            # 3. Fusion des résultats
-            combined_context = self._fuse_results(local_results, web_results)
+            # 1-3. Recherche locale + web et fusion
+            retrieval = self._retrieve(question, question_embedding, use_web, max_web_results)
 
             # 4. Génération de la réponse
-            response = self._generate_response(question, combined_context)
-
-            # 5. Mise à jour mémoire
-            full_response = {
-                **response,
-                "search_queries": search_queries,
-                "web_sources": [r.get("url", "") for r in web_results],
-                "local_sources": len(local_results),
-                "processing_time": (datetime.now() - start_time).total_seconds()
-            }
+            response = self._generate_response(question, retrieval["context"])
+
+            # 5-6. Mise à jour mémoire et cache
+            return self._finalize_response(question, response, retrieval, cache_key,
+                                           question_embedding, (use_web, max_web_results), start_time)
+
+        except Exception as e:
+            return self._error_response(e, start_time)
+
+    async def ask_question_async(self, question: str, use_web: bool = True, max_web_results: int = 3) -> Dict[str, Any]:
+        """
+        Version asynchrone de ask_question
+        Encodage et recherches (bloquants) s'exécutent dans un thread; la génération
+        passe par le client HTTP/2 partagé de LM Studio (agenerate_with_context)
+        """
+
+        self._increment_stat("total_queries")
+        start_time = datetime.now()
+
+        logger.info("Traitement question (async): '%s' (web=%s)", question, use_web)
 
-            self.memory.add_interaction(question, full_response)
+        cache_key, question_embedding, cached = await asyncio.to_thread(
+            self._lookup_cached, question, use_web, max_web_results
+        )
+        if cached is not None:
+            return {**cached, "processing_time": (datetime.now() - start_time).total_seconds()}
 
-            # 6. Logging final
-            logger.info(f"Réponse générée: {len(response['answer'])} caractères, "
-                       f"{len(combined_context)} chunks utilisés")
+        try:
+            retrieval = await asyncio.to_thread(
+                self._retrieve, question, question_embedding, use_web, max_web_results
+            )
+
+            response = await self._agenerate_response(question, retrieval["context"])
 
-            return full_response
+            return self._finalize_response(question, response, retrieval, cache_key,
+                                           question_embedding, (use_web, max_web_results), start_time)
 
         except Exception as e:
-            logger.error(f"Erreur traitement question: {e}")
-            return {
-                "answer": "Désolé, une erreur s'est produite lors du traitement de votre question.",
-                "sources": [],
-                "error": str(e),
-                "processing_time": (datetime.now() - start_time).total_seconds()
-            }
+            return self._error_response(e, start_time)
+
+    def _lookup_cached(self, question: str, use_web: bool,
+                       max_web_results: int) -> tuple[str, Optional["np.ndarray"], Optional[Dict[str, Any]]]:
+        """
+        Recherche d'une réponse en cache
+
+        Returns:
+            (clé du cache exact, embedding de la question ou None, réponse en cache ou None)
+        """
+
+        # Question identique (ordre des mots et casse ignorés)
+        cache_key = self.memory.cache_key(question, use_web, max_web_results)
+        cached = self.memory.get_cached_response(cache_key)
+        if cached is not None:
+            self._increment_stat("cache_hits")
+            logger.info("Réponse servie depuis le cache")
+            return cache_key, None, cached
+
+        # Question sémantiquement proche
+        question_embedding = None
+        if self.semantic_cache is not None:
+            try:
+                question_embedding = self.embedding_manager.encode_text(question)
+            except Exception as e:
+                logger.warning("Erreur encodage question (cache sémantique ignoré): %s", e)
+
+        if question_embedding is not None:
+            cached = self.semantic_cache.lookup(question_embedding, (use_web, max_web_results))
+            if cached is not None:
+                self._increment_stat("semantic_cache_hits")
+                logger.info("Réponse servie depuis le cache sémantique")
+
+        return cache_key, question_embedding, cached
+
+    def _retrieve(self, question: str, question_embedding: Optional["np.ndarray"],
+                  use_web: bool, max_web_results: int) -> Dict[str, Any]:
+        """Recherches locale et web puis fusion des résultats"""
+
+        # 1. Recherche locale (toujours effectuée), avec l'embedding déjà calculé
+        local_results = self._search_local(question, question_embedding)
+        self._increment_stat("local_searches")
+
+        # 2. Recherche web (si activée et pas en cache)
+        web_results = []
+        search_queries = []
+
+        if use_web:
+            if not self.memory.is_recently_searched(question):
+                web_results, search_queries = self._search_web_enhanced(question, max_web_results)
+                self._increment_stat("web_searches")
+            else:
+                self._increment_stat("cache_hits")
+                logger.info("Utilisation du cache pour éviter recherche répétée")
+
+        # 3. Fusion des résultats
+        return {
+            "local_results": local_results,
+            "web_results": web_results,
+            "search_queries": search_queries,
+            "context": self._fuse_results(local_results, web_results)
+        }
+
+    def _finalize_response(self, question: str, response: Dict[str, Any], retrieval: Dict[str, Any],
+                           cache_key: str, question_embedding: Optional["np.ndarray"],
+                           search_params: tuple, start_time: datetime) -> Dict[str, Any]:
+        """Métadonnées, mémoire de conversation et mise en cache de la réponse"""
+
+        # Une seule lecture de l'horloge
+        now = datetime.now()
+        full_response = {
+            **response,
+            "search_queries": retrieval["search_queries"],
+            "web_sources": [r.get("url", "") for r in retrieval["web_results"]],
+            "local_sources": len(retrieval["local_results"]),
+            "processing_time": (now - start_time).total_seconds()
+        }
+
+        self.memory.add_interaction(question, full_response, now)
+
+        # Seules les réponses générées par LM Studio sont mises en cache (pas les
+        # fallbacks d'une panne); copies: l'appelant modifie la réponse retournée
+        if full_response["llm_generated"]:
+            self.memory.cache_response(cache_key, dict(full_response))
+            if question_embedding is not None:
+                self.semantic_cache.add(question_embedding, search_params, dict(full_response))
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Réponse générée: %d caractères, %d chunks utilisés",
+                        len(response['answer']), len(retrieval["context"]))
+
+        return full_response
+
+    @staticmethod
+    def _error_response(error: Exception, start_time: datetime) -> Dict[str, Any]:
+        logger.error("Erreur traitement question: %s", error)
+        return {
+            "answer": "Désolé, une erreur s'est produite lors du traitement de votre question.",
+            "sources": [],
+            "error": str(error),
+            "processing_time": (datetime.now() - start_time).total_seconds()
+        }
 
-    def _search_local(self, question: str) -> List[Dict[str, Any]]:
-        """Recherche dans les connaissances locales (Phase 2)"""
+    async def aclose(self):
+        """Ferme le client HTTP/2 LM Studio de la boucle courante (s'il a été créé)"""
+        if self._llm_client is not None:
+            await self._llm_client.aclose()
+
+    def _search_local(self, question: str, question_embedding: Optional["np.ndarray"] = None) -> List[Dict[str, Any]]:
+        """
+        Recherche dans les connaissances locales (Phase 2)
+
+        Args:
+            question_embedding: Embedding de la question déjà calculé (évite un second encodage)
+        """
 
         if not self.local_available:
             logger.debug("Recherche locale ignorée - composants locaux non disponibles")
             return []
 
         try:
-            # Utiliser le pipeline RAG existant
-            result = self.local_rag.ask_question(question, max_context_results=5)
+            if question_embedding is not None:
+                # Recherche vectorielle directe: ni ré-encodage ni génération Phase 2
+                result = {"context": self._retrieve_local_context(question_embedding, max_results=5)}
+            else:
+                # Utiliser le pipeline RAG existant
+                result = self.local_rag.ask_question(question, max_context_results=5)
 
             # Convertir en format standard
             local_chunks = []
@@ -254,13 +578,33 @@ class ExtendedRAGPipeline:
                             "relevance_score": 0.8  # Score par défaut pour local
                         })
 
-            logger.debug(f"Recherche locale: {len(local_chunks)} chunks trouvés")
+            logger.debug("Recherche locale: %d chunks trouvés", len(local_chunks))
             return local_chunks
 
         except Exception as e:
-            logger.warning(f"Erreur recherche locale: {e}")
+            logger.warning("Erreur recherche locale: %s", e)
             return []
 
+    def _retrieve_local_context(self, question_embedding: "np.ndarray", max_results: int = 5,
+                                score_threshold: float = 0.3) -> str:
+        """Équivalent de RAGPipeline.retrieve_context à partir d'un embedding pré-calculé"""
+
+        results = self.local_rag.similarity_search.vector_db.search_similar(
+            question_embedding, limit=max_results
+        )
+        results = [r for r in results if r["score"] >= score_threshold]
+
+        if not results:
+            return "Aucune information pertinente trouvée dans la documentation."
+
+        # Même format que le contexte Phase 2
+        return "\n".join(
+            f"[Document {i} - Score: {r['score']:.3f}]\n"
+            f"Source: {r.get('source', 'Inconnu')}\n"
+            f"Contenu: {r['text']}\n"
+            for i, r in enumerate(results, 1)
+        )
+
     def _search_web_enhanced(self, question: str, max_results: int) -> tuple[List[Dict[str, Any]], List[str]]:
         """Recherche web avec processing complet"""
 
@@ -270,58 +614,116 @@ class ExtendedRAGPipeline:
             # Recherche web
             search_results = self.web_search.search(question, max_results=max_results)
 
-            # Processing HTML pour chaque résultat
-            web_chunks = []
-            for result in search_results:
-                chunks = self.web_processor.process_search_result(result)
-                web_chunks.extend(chunks)
+            # Processing HTML de tous les résultats en parallèle (ordre préservé)
+            process = self.web_processor.process_search_result
+            futures = [self._fetch_pool.submit(process, result) for result in search_results]
+
+            web_chunks = list(chain.from_iterable(
+                self._completed_chunks(search_results, futures)
+            ))
 
-            # Indexation temporaire (optionnel pour recherche future)
-            if web_chunks:
+            # Indexation temporaire (optionnel pour recherche future, nécessite Phase 2)
+            if web_chunks and self.vector_db is not None:
                 self._index_web_chunks_temporarily(web_chunks)
 
-            logger.debug(f"Recherche web: {len(search_results)} résultats → {len(web_chunks)} chunks")
+            logger.debug("Recherche web: %d résultats → %d chunks", len(search_results), len(web_chunks))
             return web_chunks, search_queries
 
         except Exception as e:
-            logger.warning(f"Erreur recherche web: {e}")
+            logger.warning("Erreur recherche web: %s", e)
             return [], search_queries
 
+    @staticmethod
+    def _completed_chunks(search_results: List[Dict[str, Any]], futures: List[Future]) -> Iterator[List[Dict[str, Any]]]:
+        """Chunks de chaque page dans l'ordre des résultats (pages en erreur ignorées)"""
+        for result, future in zip(search_results, futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                logger.warning("Erreur traitement %s: %s", result.get('url'), e)
+
     def _index_web_chunks_temporarily(self, chunks: List[Dict[str, Any]]):
-        """Indexation temporaire des chunks web (pour recherche future)"""
+        """Indexation temporaire des chunks web (pour recherche future), conservés WEB_CHUNK_TTL secondes"""
 
         try:
-            # Préparer les données pour Qdrant
-            points = []
-            embeddings = []
-
-            for chunk in chunks[:20]:  # Limiter pour performance
-                # Générer embedding
-                embedding = self.embedding_manager.encode_text(chunk["text"])
-
-                # Préparer point
-                point = {
-                    "id": f"web_{chunk.get('chunk_id', 0)}_{hash(chunk['text']) % 1000000}",
-                    "vector": embedding,
-                    "payload": {
-                        "text": chunk["text"],
-                        "source": chunk.get("url", "web"),
+            now_ts = datetime.now().timestamp()  # Horodatage lu une fois
+
+            # Chunks encore indexés (même texte, page re-téléchargée) ignorés: ni encodage ni upsert
+            new_chunks: Dict[int, Dict[str, Any]] = {}
+            with self._web_collection_lock:
+                for chunk in chunks:
+                    fingerprint = _text_fingerprint(chunk["text"][:4096])
+                    if fingerprint not in new_chunks and self._indexed_fingerprints.get(fingerprint, 0.0) <= now_ts:
+                        new_chunks[fingerprint] = chunk
+                        if len(new_chunks) == 20:  # Limiter pour performance
+                            break
+
+            if not new_chunks:
+                return
+
+            # Un seul passage du modèle pour tous les chunks (matrice float32 normalisée)
+            embeddings = self.embedding_manager.encode_batch([chunk["text"] for chunk in new_chunks.values()])
+
+            documents = [
+                {
+                    "text": chunk["text"],
+                    "source": chunk.get("url", "web"),
+                    "title": chunk.get("title", ""),
+                    "chunk_id": chunk.get("chunk_id", i),
+                    "metadata": {
                         "source_type": "web",
-                        "timestamp": chunk.get("timestamp", datetime.now().timestamp())
+                        "timestamp": chunk.get("timestamp", now_ts),
+                        "indexed_at": now_ts,
+                        "fingerprint": f"{fingerprint:016x}"
                     }
                 }
+                for i, (fingerprint, chunk) in enumerate(new_chunks.items())
+            ]
 
-                points.append(point)
-                embeddings.append(embedding)
+            # Indexer dans Qdrant (collection web séparée des documents locaux); l'empreinte
+            # 64 bits sert d'ID de point: un chunk ré-indexé remplace le précédent, même entre exécutions
+            self._ensure_web_collection(embeddings.shape[1])
+            self.vector_db.add_documents(documents, embeddings, ids=list(new_chunks))
 
-            if points:
-                # Indexer dans Qdrant (collection temporaire)
-                self.vector_db.add_documents_batch(points)
+            with self._web_collection_lock:
+                self._indexed_fingerprints.update(dict.fromkeys(new_chunks, now_ts + self.WEB_CHUNK_TTL))
 
-                logger.debug(f"Indexation temporaire: {len(points)} chunks web")
+            logger.debug("Indexation temporaire: %d chunks web", len(documents))
+
+            self._cleanup_web_collection(now_ts)
 
         except Exception as e:
-            logger.warning(f"Erreur indexation temporaire: {e}")
+            logger.warning("Erreur indexation temporaire: %s", e)
+
+    def _cleanup_web_collection(self, now_ts: float):
+        """Supprime les chunks web indexés depuis plus de WEB_CHUNK_TTL (au plus toutes les WEB_CLEANUP_INTERVAL s)"""
+        with self._web_collection_lock:
+            if now_ts < self._web_cleanup_due:
+                return
+            self._web_cleanup_due = now_ts + self.WEB_CLEANUP_INTERVAL
+
+            # Empreintes expirées oubliées: ces chunks seront ré-indexés s'ils réapparaissent
+            self._indexed_fingerprints = {
+                fingerprint: expires
+                for fingerprint, expires in self._indexed_fingerprints.items()
+                if expires > now_ts
+            }
+
+        self.vector_db.delete_older_than(
+            now_ts - self.WEB_CHUNK_TTL, field="indexed_at", collection_name=self.WEB_COLLECTION
+        )
+
+    def _ensure_web_collection(self, vector_size: int):
+        """Connexion et création de la collection web au premier usage"""
+        if self._web_collection_ready:
+            return
+
+        with self._web_collection_lock:
+            if not self._web_collection_ready:
+                if self.vector_db.client is None:
+                    self.vector_db.connect()
+                self.vector_db.create_collection(vector_size, collection_name=self.WEB_COLLECTION)
+                self._web_collection_ready = True
 
     def _fuse_results(self, local_results: List[Dict[str, Any]],
                      web_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -332,14 +734,39 @@ class ExtendedRAGPipeline:
         # Combiner tous les résultats
         all_results = local_results + web_results
 
-        # Calculer scores de pertinence
-        for result in all_results:
-            result["relevance_score"] = self._calculate_relevance_score(result)
+        # Horodatage de référence unique pour tous les résultats
+        now_ts = datetime.now().timestamp()
 
-        # Trier par score décroissant
-        sorted_results = sorted(all_results,
-                              key=lambda x: x["relevance_score"],
-                              reverse=True)
+        if NUMPY_AVAILABLE and len(all_results) > self.VECTORIZE_THRESHOLD:
+            # Calculer scores de pertinence (vectorisé)
+            scores = self._calculate_relevance_scores(all_results, now_ts)
+            for result, score in zip(all_results, scores.tolist()):
+                result["relevance_score"] = score
+        else:
+            # Calculer scores de pertinence
+            for result in all_results:
+                result["relevance_score"] = self._calculate_relevance_score(result, now_ts)
+
+        # Sans résultats web, tous les chunks sont locaux: la diversification se réduit
+        # aux 3 meilleurs, sans regroupement ni tri
+        if not web_results:
+            final_results = heapq.nlargest(3, all_results, key=lambda x: x["relevance_score"])
+            logger.debug("Fusion: %d local (web vide) → %d final", len(local_results), len(final_results))
+            return final_results
+
+        # Seuls les 3 meilleurs de chaque type peuvent survivre à la diversification:
+        # sélection O(N log 3) par type au lieu d'un tri complet
+        by_type = {}
+        for index, result in enumerate(all_results):
+            by_type.setdefault(result.get("source_type", "unknown"), []).append((index, result))
+
+        candidates = []
+        for group in by_type.values():
+            candidates.extend(heapq.nlargest(3, group, key=lambda item: item[1]["relevance_score"]))
+
+        # Trier les candidats par score décroissant (égalités: ordre d'origine, comme sorted)
+        candidates.sort(key=lambda item: (-item[1]["relevance_score"], item[0]))
+        sorted_results = [result for _, result in candidates]
 
         # Diversification des sources (max 3 par source type)
         diversified = self._diversify_sources(sorted_results, max_per_source=3)
@@ -347,12 +774,12 @@ class ExtendedRAGPipeline:
         # Limiter total
         final_results = diversified[:10]  # Maximum 10 chunks
 
-        logger.debug(f"Fusion: {len(local_results)} local + {len(web_results)} web "
-                    f"→ {len(final_results)} final")
+        logger.debug("Fusion: %d local + %d web → %d final",
+                     len(local_results), len(web_results), len(final_results))
 
         return final_results
 
-    def _calculate_relevance_score(self, result: Dict[str, Any]) -> float:
+    def _calculate_relevance_score(self, result: Dict[str, Any], now_ts: float) -> float:
         """Calculer score de pertinence d'un résultat"""
 
         score = 0.5  # Score de base
@@ -360,7 +787,7 @@ class ExtendedRAGPipeline:
         # Bonus pour contenu récent (web)
         if result.get("source_type") == "web":
             timestamp = result.get("timestamp", 0)
-            hours_old = (datetime.now().timestamp() - timestamp) / 3600
+            hours_old = (now_ts - timestamp) / 3600
 
             if hours_old < 24:  # Moins de 24h
                 score += 0.3
@@ -380,39 +807,74 @@ class ExtendedRAGPipeline:
 
         return max(0.0, min(1.0, score))  # Normaliser entre 0 et 1
 
+    @staticmethod
+    def _calculate_relevance_scores(results: List[Dict[str, Any]], now_ts: float) -> "np.ndarray":
+        """Version vectorisée de _calculate_relevance_score (mêmes règles, mêmes scores)"""
+
+        n = len(results)
+        source_types = [r.get("source_type") for r in results]
+        is_web = np.fromiter((t == "web" for t in source_types), dtype=bool, count=n)
+        is_local = np.fromiter((t == "local" for t in source_types), dtype=bool, count=n)
+        timestamps = np.fromiter(
+            (r.get("timestamp", 0) if t == "web" else 0 for r, t in zip(results, source_types)),
+            dtype=np.float64, count=n
+        )
+        text_lengths = np.fromiter((len(r.get("text", "")) for r in results), dtype=np.int64, count=n)
+
+        hours_old = (now_ts - timestamps) / 3600
+
+        scores = np.full(n, 0.5)  # Score de base
+        scores += np.where(is_web & (hours_old < 24), 0.3,
+                           np.where(is_web & (hours_old < 168), 0.2, 0.0))
+        scores += np.where(is_local, 0.2, 0.0)
+        scores += np.where(text_lengths < 100, -0.2,
+                           np.where(text_lengths > 1000, 0.1, 0.0))
+
+        return np.clip(scores, 0.0, 1.0, out=scores)
+
     def _diversify_sources(self, results: List[Dict[str, Any]],
                           max_per_source: int = 3) -> List[Dict[str, Any]]:
         """Diversification des sources pour éviter biais"""
 
-        source_counts = {}
+        source_counts = Counter()  # 0 pour un type absent, sans second accès
         diversified = []
 
         for result in results:
             source_type = result.get("source_type", "unknown")
 
-            if source_counts.get(source_type, 0) < max_per_source:
+            if source_counts[source_type] < max_per_source:
                 diversified.append(result)
-                source_counts[source_type] = source_counts.get(source_type, 0) + 1
+                source_counts[source_type] += 1
 
         return diversified
 
     def _generate_response(self, question: str, context: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Génération de réponse avec sources"""
 
-        # Construction du contexte textuel
-        context_text = self._build_context_text(context)
+        # Génération: LM Studio construit son prompt à partir d'extraits tronqués
+        answer, llm_generated = self._simulate_generation(question, context)
 
-        # Construction du prompt
-        prompt = self._build_web_aware_prompt(question, context_text)
+        return self._build_response(answer, llm_generated, context)
 
-        # Simulation de génération (à remplacer par vrai LLM)
-        answer = self._simulate_generation(question, context)
+    async def _agenerate_response(self, question: str, context: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Version asynchrone de _generate_response"""
+
+        answer, llm_generated = await self._asimulate_generation(question, context)
+
+        return self._build_response(answer, llm_generated, context)
+
+    def _build_response(self, answer: str, llm_generated: bool, context: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Réponse avec sources et métadonnées du contexte"""
+
+        # Construction du contexte textuel (une seule fois, pour les métadonnées)
+        context_text = self._build_context_text(context)
 
         # Extraction des sources
         sources = self._extract_sources(context)
 
         return {
             "answer": answer,
+            "llm_generated": llm_generated,
             "sources": sources,
             "context_chunks": len(context),
             "context_length": len(context_text)
@@ -421,94 +883,137 @@ class ExtendedRAGPipeline:
     def _build_context_text(self, context: List[Dict[str, Any]]) -> str:
         """Construire le texte de contexte à partir des chunks"""
 
-        context_parts = []
-
-        for i, chunk in enumerate(context):
-            source_type = chunk.get("source_type", "unknown")
-            source = chunk.get("source", "unknown")
-
-            # Marquer la source
-            source_marker = f"[{source_type.upper()}: {source}]"
-
-            context_parts.append(f"{source_marker}\n{chunk['text']}")
-
-        return "\n\n---\n\n".join(context_parts)
-
-    def _build_web_aware_prompt(self, question: str, context: str) -> str:
-        """Construction du prompt pour agent web-aware"""
-
-        prompt = f"""
-Vous êtes un assistant intelligent qui combine connaissances internes et informations web.
-
-CONTEXTE DISPONIBLE:
-{context}
-
-QUESTION: {question}
+        # Chaque chunk précédé de sa source, assemblés en un seul join
+        return "\n\n---\n\n".join(
+            f"[{chunk.get('source_type', 'unknown').upper()}: {chunk.get('source', 'unknown')}]\n{chunk['text']}"
+            for chunk in context
+        )
+
+    @staticmethod
+    def _llm_inputs(context: List[Dict[str, Any]]) -> tuple[str, List[Dict[str, str]]]:
+        """Contexte textuel et sources (max 5) préparés pour LM Studio"""
+
+        sources = [
+            {
+                "title": chunk.get("title", chunk.get("source", "Source")),
+                "url": chunk.get("url", chunk.get("source", "")),
+                "snippet": chunk.get("text", "")[:300]  # Limiter la longueur
+            }
+            for chunk in islice(context, 5)
+        ]
 
-INSTRUCTIONS:
-- Utilisez les informations du contexte pour répondre
-- Privilégiez les informations récentes pour les données temporelles
-- Indiquez clairement vos sources quand pertinent
-- Si l'information n'est pas dans le contexte, dites-le clairement
-- Soyez précis et factuel
+        context_text = "\n\n".join(
+            chunk.get("text", "")[:500]
+            for chunk in islice(context, 10)
+        )
 
-RÉPONSE:
-"""
+        return context_text, sources
 
-        return prompt.strip()
+    def _simulate_generation(self, question: str, context: List[Dict[str, Any]]) -> tuple[str, bool]:
+        """
+        Génération de réponse avec LM Studio
 
-    def _simulate_generation(self, question: str, context: List[Dict[str, Any]]) -> str:
-        """Génération de réponse avec LM Studio"""
+        Returns:
+            (réponse, True si générée par LM Studio / False pour le fallback)
+        """
         
         # Essayer d'utiliser LM Studio si disponible
         try:
-            from src.lmstudio_client import get_lm_studio_client
-            
-            llm_client = get_lm_studio_client()
+            llm_client = self._get_llm_client()
             
-            # Tester la connexion
-            if not llm_client.test_connection():
+            # Connexion testée récemment (succès ou échec mémorisé)
+            if llm_client is None:
                 logger.warning("LM Studio non disponible, utilisation du fallback")
-                return self._fallback_generation(question, context)
-            
-            # Préparer les sources pour LM Studio
-            sources = []
-            for chunk in context[:5]:  # Max 5 sources
-                sources.append({
-                    "title": chunk.get("title", chunk.get("source", "Source")),
-                    "url": chunk.get("url", chunk.get("source", "")),
-                    "snippet": chunk.get("text", "")[:300]  # Limiter la longueur
-                })
+                return self._fallback_generation(question, context), False
             
-            # Construire le contexte textuel
-            context_text = "\n\n".join([
-                chunk.get("text", "")[:500]
-                for chunk in context[:10]
-            ])
+            context_text, sources = self._llm_inputs(context)
             
             # Générer avec LM Studio
-            logger.info(f"Génération LM Studio pour: '{question}'")
+            logger.info("Génération LM Studio pour: '%s'", question)
             answer = llm_client.generate_with_context(
                 question=question,
                 context=context_text,
                 sources=sources
             )
             
-            return answer
+            return answer, True
             
         except ImportError:
             logger.warning("Module lmstudio_client non disponible")
-            return self._fallback_generation(question, context)
+            return self._fallback_generation(question, context), False
         except Exception as e:
-            logger.error(f"Erreur génération LM Studio: {e}")
-            return self._fallback_generation(question, context)
+            # LMStudioError (connexion, timeout, HTTP): état de santé invalidé,
+            # la connexion est re-testée au prochain appel
+            logger.error("Erreur génération LM Studio: %s", e)
+            self._llm_checked_until = 0.0
+            return self._fallback_generation(question, context), False
+
+    async def _asimulate_generation(self, question: str, context: List[Dict[str, Any]]) -> tuple[str, bool]:
+        """Version asynchrone de _simulate_generation (client HTTP/2 partagé)"""
+
+        try:
+            llm_client = await self._aget_llm_client()
+
+            if llm_client is None:
+                logger.warning("LM Studio non disponible, utilisation du fallback")
+                return self._fallback_generation(question, context), False
+
+            context_text, sources = self._llm_inputs(context)
+
+            logger.info("Génération LM Studio (async) pour: '%s'", question)
+            answer = await llm_client.agenerate_with_context(
+                question=question,
+                context=context_text,
+                sources=sources
+            )
+
+            return answer, True
+
+        except ImportError:
+            logger.warning("Module lmstudio_client non disponible")
+            return self._fallback_generation(question, context), False
+        except Exception as e:
+            logger.error("Erreur génération LM Studio: %s", e)
+            self._llm_checked_until = 0.0
+            return self._fallback_generation(question, context), False
+    
+    def _get_llm_client(self):
+        """
+        Client LM Studio s'il est joignable, sinon None
+        Le test de connexion (aller-retour HTTP) n'est refait qu'après LLM_HEALTH_TTL
+        secondes, ce qui sert aussi de délai avant de ré-essayer un LM Studio arrêté
+        """
+        now = time.monotonic()
+        if now >= self._llm_checked_until:
+            if self._llm_client is None:
+                from src.lmstudio_client import get_lm_studio_client
+                self._llm_client = get_lm_studio_client()
+
+            self._llm_client_ok = self._llm_client.test_connection()
+            self._llm_checked_until = now + self.LLM_HEALTH_TTL
+
+        return self._llm_client if self._llm_client_ok else None
+
+    async def _aget_llm_client(self):
+        """Version asynchrone de _get_llm_client (test de connexion non bloquant)"""
+        now = time.monotonic()
+        if now >= self._llm_checked_until:
+            if self._llm_client is None:
+                from src.lmstudio_client import get_lm_studio_client
+                self._llm_client = get_lm_studio_client()
+
+            self._llm_client_ok = await self._llm_client.atest_connection()
+            self._llm_checked_until = now + self.LLM_HEALTH_TTL
+
+        return self._llm_client if self._llm_client_ok else None
     
     def _fallback_generation(self, question: str, context: List[Dict[str, Any]]) -> str:
         """Génération de fallback si LM Studio non disponible"""
         
-        # Analyse basique du contexte
-        has_local = any(c.get("source_type") == "local" for c in context)
-        has_web = any(c.get("source_type") == "web" for c in context)
+        # Analyse basique du contexte (une seule passe)
+        source_types = {c.get("source_type") for c in context}
+        has_local = "local" in source_types
+        has_web = "web" in source_types
 
         # Réponse basée sur disponibilité des sources
         if has_web and has_local:
@@ -523,37 +1028,43 @@ RÉPONSE:
     def _extract_sources(self, context: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         """Extraire la liste des sources utilisées"""
 
-        sources = []
-        seen_sources = set()
+        # Dictionnaire indexé par source: déduplication en conservant l'ordre d'insertion
+        sources = {}
 
         for chunk in context:
             source = chunk.get("source", "unknown")
+            if source in sources:
+                continue
+
             source_type = chunk.get("source_type", "unknown")
+            sources[source] = {
+                "url": source if source_type == "web" else "",
+                "type": source_type,
+                "title": chunk.get("title", source)
+            }
 
-            if source not in seen_sources:
-                sources.append({
-                    "url": source if source_type == "web" else "",
-                    "type": source_type,
-                    "title": chunk.get("title", source)
-                })
-                seen_sources.add(source)
+        return list(sources.values())
 
-        return sources
+    def _increment_stat(self, name: str):
+        """Incrémente un compteur de statistiques (thread-safe)"""
+        with self._stats_lock:
+            self.stats[name] += 1
 
     def get_stats(self) -> Dict[str, Any]:
         """Récupérer les statistiques du pipeline"""
-        return {
-            **self.stats,
-            "memory_interactions": len(self.memory.interactions),
-            "cache_size": len(self.memory.search_cache)
-        }
-
-# Instance globale
-extended_rag_pipeline = ExtendedRAGPipeline()
+        with self._stats_lock:
+            stats = self.stats.copy()
+        stats["memory_interactions"] = len(self.memory.interactions)
+        stats["cache_size"] = len(self.memory.search_cache)
+        return stats
 
+@functools.cache
 def get_extended_rag_pipeline() -> ExtendedRAGPipeline:
-    """Factory function pour l'instance globale"""
-    return extended_rag_pipeline
+    """
+    Factory function pour l'instance globale
+    Créée au premier appel: importer le module ne charge ni Phase 2 ni le modèle d'embeddings
+    """
+    return ExtendedRAGPipeline()
 
 # Tests unitaires
 if __name__ == "__main__":
@@ -4,12 +4,187 @@ Module de parsing HTML pour Phase 3 - Ask-the-Web Agent
 Extrait le contenu textuel des pages web pour l'intégration RAG
 """
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit
+import asyncio
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any, Optional
 import re
+import os
 import logging
-from urllib.parse import urlparse
+import threading
+import time
+from collections import OrderedDict
+from itertools import accumulate
+
+# Parseur C lxml si disponible (construction de l'arbre 5-10x plus rapide)
+try:
+    from lxml import etree
+    BS4_PARSER = "lxml"
+except ImportError:
+    etree = None
+    BS4_PARSER = "html.parser"
+
+# Calcul vectorisé des positions de mots pour le chunking - optionnel
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Compilation JIT du calcul des bornes de chunks - optionnel
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+    NUMBA_AVAILABLE = False
+
+# Client HTTP asynchrone pour le traitement concurrent des pages - optionnel
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+# Moteur Lexbor (selectolax) pour le chemin d'extraction - optionnel
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    LexborHTMLParser = None
+    SELECTOLAX_AVAILABLE = False
+
+# Moteur d'extraction: "selectolax" (par défaut si installé) ou "bs4"
+HTML_ENGINE = os.getenv("HTML_PARSER_ENGINE", "selectolax" if SELECTOLAX_AVAILABLE else "bs4")
+if HTML_ENGINE == "selectolax" and not SELECTOLAX_AVAILABLE:
+    HTML_ENGINE = "bs4"
+
+# Taille des blocs fournis au parseur incrémental lxml (caractères)
+PULL_CHUNK_SIZE = 16 * 1024
+
+# Taille maximale du corps HTML téléchargé (octets décompressés)
+MAX_CONTENT_BYTES = 2_000_000
+
+# Éléments à supprimer complètement
+UNWANTED_TAGS = frozenset({
+    'script', 'style', 'nav', 'header', 'footer', 'aside',
+    'noscript', 'iframe', 'object', 'embed', 'form',
+    'button', 'input', 'select', 'textarea'
+})
+
+# Classes indésirables (recherche partielle, insensible à la casse)
+UNWANTED_CLASSES = (
+    'advertisement', 'ads', 'sidebar', 'menu', 'navigation',
+    'footer', 'header', 'popup', 'modal', 'cookie', 'gdpr',
+    'social', 'share', 'comment', 'related'
+)
+
+# IDs indésirables (correspondance exacte)
+UNWANTED_IDS = frozenset({
+    'header', 'footer', 'sidebar', 'menu', 'nav',
+    'advertisement', 'ads', 'popup', 'modal'
+})
+
+# Sélecteurs de contenu principal (par priorité décroissante)
+CONTENT_SELECTORS = (
+    # Sélecteurs sémantiques HTML5
+    'main',
+    'article',
+
+    # Classes et IDs courants
+    '[class*="content"]',
+    '[class*="article"]',
+    '[class*="post"]',
+    '[class*="entry"]',
+    '.main-content',
+    '.post-content',
+    '.entry-content',
+    '#main-content',
+    '#content',
+    '#main',
+
+    # Conteneurs génériques
+    '[class*="container"]',
+    '[class*="wrapper"]',
+
+    # Fallback: body
+    'body'
+)
+
+# Blocs collectés par l'extraction structurée Lexbor (paragraphes, titres, éléments de liste)
+_STRUCTURE_SELECTOR = "p,h1,h2,h3,h4,h5,h6,li"
+
+# Motifs précompilés (nettoyage du texte, classes indésirables, sections)
+_CTRL_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+_SPACES_RE = re.compile(r'  +')  # espaces répétés uniquement: les espaces isolés ne sont pas réécrits
+_SPECIAL_RE = re.compile(r'[^\w\s\n.,!?\-()\[\]{}:;"\'/\\]')
+_LONGURL_RE = re.compile(r'https?://[^\s]{50,}')
+_REPEAT_RE = re.compile(r'(.)\1\1\1+')
+_SECTION_RE = re.compile(r'\n##\s+')
+_URL_RE = re.compile(r'https?://[^/?#\s]', re.I)
+_UNWANTED_CLASS_RE = re.compile('|'.join(UNWANTED_CLASSES), re.I)
+
+def _lexbor_text(node, separator: str) -> str:
+    """
+    Équivalent de get_text(separator, strip=True) de BS4 pour un nœud Lexbor
+    (Lexbor conserve les nœuds texte vides après strip, d'où des séparateurs doublés)
+    """
+    return separator.join(filter(None, node.text(separator='\x00', strip=True).split('\x00')))
+
+def _text_key(text: str) -> tuple:
+    """Empreinte compacte d'un bloc de texte (longueur + début) pour la déduplication"""
+    return len(text), hash(text[:128])
+
+def _word_offsets(words: List[str]):
+    """Positions (début, fin) de chaque mot dans ' '.join(words)"""
+    if NUMPY_AVAILABLE:
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        ends = np.cumsum(lengths + 1) - 1
+        return ends - lengths, ends
+
+    ends = [end - 1 for end in accumulate(len(word) + 1 for word in words)]
+    return [end - len(word) for end, word in zip(ends, words)], ends
+
+if NUMBA_AVAILABLE:
+    @njit("int64[:, :](int64, int64, int64, int64)", cache=True)
+    def _chunk_indices_jit(n_words, chunk_size, overlap, min_chunk_size):
+        step = chunk_size - overlap
+        out = np.empty(((n_words + step - 1) // step, 3), dtype=np.int64)
+        count = 0
+        for start in range(0, n_words, step):
+            end = min(start + chunk_size, n_words)
+            if end - start < min_chunk_size // 2:
+                continue
+            out[count, 0] = count
+            out[count, 1] = start
+            out[count, 2] = end
+            count += 1
+        return out[:count]
+
+    def _chunk_indices(n_words: int, chunk_size: int, overlap: int, min_chunk_size: int) -> List[List[int]]:
+        """Bornes [chunk_id, start_word, end_word] des chunks retenus (compilé avec Numba)"""
+        return _chunk_indices_jit(n_words, chunk_size, overlap, min_chunk_size).tolist()
+else:
+    def _chunk_indices(n_words: int, chunk_size: int, overlap: int, min_chunk_size: int) -> List[List[int]]:
+        """Bornes [chunk_id, start_word, end_word] des chunks retenus"""
+        bounds = []
+        for start in range(0, n_words, chunk_size - overlap):
+            end = min(start + chunk_size, n_words)
+            if end - start >= min_chunk_size // 2:
+                bounds.append([len(bounds), start, end])
+        return bounds
+
+# Sélecteur CSS unique (balises, classes, IDs) pour une seule passe Lexbor
+_UNWANTED_SELECTOR = ",".join([
+    *sorted(UNWANTED_TAGS),
+    *(f'[class*="{name}" i]' for name in UNWANTED_CLASSES),
+    *(f'[id="{name}"]' for name in sorted(UNWANTED_IDS)),
+])
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -21,13 +196,21 @@ class HTMLParser:
     Optimisé pour le contenu informatif (articles, documentation, etc.)
     """
 
-    def __init__(self, timeout: int = 10, user_agent: str = None):
+    def __init__(
+        self,
+        timeout: int = 10,
+        user_agent: str = None,
+        cache_size: int = 512,
+        cache_ttl_seconds: int = 3600
+    ):
         """
         Initialise le parseur HTML
 
         Args:
             timeout: Timeout pour les requêtes HTTP (secondes)
             user_agent: User-Agent pour les requêtes
+            cache_size: Nombre maximum de pages parsées en cache (LRU)
+            cache_ttl_seconds: Durée de vie des pages en cache sans ETag/Last-Modified
         """
         self.timeout = timeout
         self.user_agent = user_agent or "Mozilla/5.0 (compatible; WebScraper/1.0; +https://example.com/bot)"
@@ -41,6 +224,24 @@ class HTMLParser:
             "Upgrade-Insecure-Requests": "1",
         }
 
+        # Session persistante: connexions keep-alive réutilisées entre les pages,
+        # nouvelles tentatives sur les erreurs de passerelle
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Cache LRU des textes parsés: url -> (expiration, etag, last_modified, texte)
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._page_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         logger.info("HTMLParser initialisé")
 
     def parse_url(self, url: str) -> Optional[str]:
@@ -61,35 +262,40 @@ class HTMLParser:
                 logger.warning(f"URL invalide: {url}")
                 return None
 
-            response = requests.get(
+            # Page en cache encore valide (sans validateur HTTP): ni téléchargement ni parsing
+            cached = self._get_cached_page(url)
+            if cached is not None and not self._has_validators(cached):
+                return cached[3]
+
+            # Corps lu en flux: rien n'est téléchargé avant la vérification des en-têtes
+            with self.session.get(
                 url,
-                headers=self.headers,
+                headers=self._conditional_headers(cached),
                 timeout=self.timeout,
-                allow_redirects=True
-            )
-
-            response.raise_for_status()
-
-            # Vérification du type de contenu
-            content_type = response.headers.get('content-type', '').lower()
-            if 'text/html' not in content_type:
-                logger.warning(f"Type de contenu non HTML: {content_type}")
-                return None
+                allow_redirects=True,
+                stream=True
+            ) as response:
+                if response.status_code == 304 and cached is not None:
+                    logger.info(f"Page inchangée, texte en cache: {url}")
+                    return cached[3]
 
-            # Parsing HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+                response.raise_for_status()
 
-            # Extraction du texte
-            text = self._extract_main_content(soup)
+                if not self._accept_headers(response.headers):
+                    return None
 
-            # Nettoyage
-            clean_text = self._clean_text(text)
+                # Décompression gzip pendant la lecture, plafonnée à MAX_CONTENT_BYTES
+                response.raw.decode_content = True
+                content = response.raw.read(MAX_CONTENT_BYTES + 1)
 
-            if len(clean_text) < 100:  # Texte trop court
-                logger.warning(f"Texte extrait trop court: {len(clean_text)} caractères")
+            if len(content) > MAX_CONTENT_BYTES:
+                logger.warning(f"Page trop volumineuse (> {MAX_CONTENT_BYTES} octets): {url}")
                 return None
 
-            logger.info(f"Texte extrait: {len(clean_text)} caractères")
+            # Parsing, extraction et nettoyage du texte
+            clean_text = self._accept_text(self._parse_html(content))
+            if clean_text:
+                self._cache_page(url, response.headers, clean_text)
             return clean_text
 
         except requests.exceptions.Timeout:
@@ -102,14 +308,204 @@ class HTMLParser:
             logger.error(f"Erreur parsing {url}: {e}")
             return None
 
-    def _is_valid_url(self, url: str) -> bool:
-        """Valide qu'une URL est bien formée et sûre"""
+    async def aparse_url(self, client: "httpx.AsyncClient", url: str) -> Optional[str]:
+        """
+        Version asynchrone de parse_url sur un client httpx partagé
+        Le parsing (CPU) est exécuté dans un thread pour ne pas bloquer la boucle
+
+        Args:
+            client: Client httpx partagé (connexions keep-alive réutilisées)
+            url: URL de la page à parser
+
+        Returns:
+            Texte extrait et nettoyé, ou None si erreur
+        """
         try:
-            parsed = urlparse(url)
-            return all([parsed.scheme, parsed.netloc]) and parsed.scheme in ['http', 'https']
-        except:
+            logger.info(f"Téléchargement: {url}")
+
+            if not self._is_valid_url(url):
+                logger.warning(f"URL invalide: {url}")
+                return None
+
+            cached = self._get_cached_page(url)
+            if cached is not None and not self._has_validators(cached):
+                return cached[3]
+
+            async with client.stream(
+                "GET",
+                url,
+                headers={**self.headers, **self._conditional_headers(cached)},
+                timeout=self.timeout,
+                follow_redirects=True
+            ) as response:
+                if response.status_code == 304 and cached is not None:
+                    logger.info(f"Page inchangée, texte en cache: {url}")
+                    return cached[3]
+
+                response.raise_for_status()
+
+                if not self._accept_headers(response.headers):
+                    return None
+
+                content = bytearray()
+                async for data in response.aiter_bytes():
+                    content += data
+                    if len(content) > MAX_CONTENT_BYTES:
+                        logger.warning(f"Page trop volumineuse (> {MAX_CONTENT_BYTES} octets): {url}")
+                        return None
+
+            clean_text = self._accept_text(
+                await asyncio.to_thread(self._parse_html, bytes(content))
+            )
+            if clean_text:
+                self._cache_page(url, response.headers, clean_text)
+            return clean_text
+
+        except httpx.TimeoutException:
+            logger.error(f"Timeout pour {url}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"Erreur HTTP pour {url}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Erreur parsing {url}: {e}")
+            return None
+
+    def _get_cached_page(self, url: str) -> Optional[tuple]:
+        """
+        Retourne l'entrée en cache d'une URL (LRU)
+        Les entrées avec ETag/Last-Modified sont revalidées par requête conditionnelle,
+        les autres expirent après cache_ttl_seconds
+        """
+        with self._cache_lock:
+            entry = self._page_cache.get(url)
+            if entry is None:
+                return None
+
+            if not self._has_validators(entry) and entry[0] <= time.monotonic():
+                del self._page_cache[url]
+                return None
+
+            self._page_cache.move_to_end(url)
+            return entry
+
+    @staticmethod
+    def _has_validators(entry: tuple) -> bool:
+        """Vérifie si une entrée de cache peut être revalidée (ETag ou Last-Modified)"""
+        return bool(entry[1] or entry[2])
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[tuple]) -> Dict[str, str]:
+        """En-têtes If-None-Match / If-Modified-Since pour une entrée de cache"""
+        headers = {}
+        if entry is not None:
+            if entry[1]:
+                headers["If-None-Match"] = entry[1]
+            if entry[2]:
+                headers["If-Modified-Since"] = entry[2]
+        return headers
+
+    def _cache_page(self, url: str, headers, text: str):
+        """Met en cache le texte parsé d'une page avec ses validateurs HTTP"""
+        entry = (
+            time.monotonic() + self.cache_ttl_seconds,
+            headers.get('etag'),
+            headers.get('last-modified'),
+            text
+        )
+
+        with self._cache_lock:
+            self._page_cache[url] = entry
+            self._page_cache.move_to_end(url)
+            while len(self._page_cache) > self.cache_size:
+                self._page_cache.popitem(last=False)
+
+    def _accept_headers(self, headers) -> bool:
+        """Vérifie le type de contenu et la taille annoncée avant de lire le corps"""
+        content_type = headers.get('content-type', '').lower()
+        if 'text/html' not in content_type:
+            logger.warning(f"Type de contenu non HTML: {content_type}")
+            return False
+
+        content_length = headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) > MAX_CONTENT_BYTES:
+            logger.warning(f"Page trop volumineuse: {content_length} octets")
             return False
 
+        return True
+
+    def _accept_text(self, clean_text: str) -> Optional[str]:
+        """Rejette les textes trop courts pour être utiles"""
+        if len(clean_text) < 100:  # Texte trop court
+            logger.warning(f"Texte extrait trop court: {len(clean_text)} caractères")
+            return None
+
+        logger.info(f"Texte extrait: {len(clean_text)} caractères")
+        return clean_text
+
+    def _is_valid_url(self, url: str) -> bool:
+        """Valide qu'une URL est bien formée et sûre (schéma http(s) + hôte non vide)"""
+        return isinstance(url, str) and _URL_RE.match(url) is not None
+
+    def _parse_html(self, content: bytes) -> str:
+        """Extrait le texte principal nettoyé avec le moteur configuré (HTML_ENGINE)"""
+        if HTML_ENGINE == "selectolax":
+            text = self._extract_main_content_lexbor(LexborHTMLParser(content, encoding=True))
+        else:
+            markup = UnicodeDammit(content, is_html=True).unicode_markup or content
+            text = self._parse_main_early(markup) if etree is not None and isinstance(markup, str) else None
+            if text is None:
+                text = self._extract_main_content(BeautifulSoup(markup, BS4_PARSER))
+
+        return self._clean_text(text)
+
+    def _parse_main_early(self, markup: str) -> Optional[str]:
+        """
+        Parsing incrémental (lxml) arrêté à la fermeture du premier <main>
+        Le reste du document n'est ni lu ni construit en arbre
+
+        Returns:
+            Texte structuré du <main>, ou None si le document complet doit être parsé
+            (pas de <main>, <main> supprimé par le nettoyage ou pas assez riche)
+        """
+        parser = etree.HTMLPullParser(events=('end',), tag='main')
+
+        for offset in range(0, len(markup), PULL_CHUNK_SIZE):
+            parser.feed(markup[offset:offset + PULL_CHUNK_SIZE])
+
+            for _, element in parser.read_events():
+                ancestors = list(element.iterancestors())
+                if any(ancestor.tag == 'main' for ancestor in ancestors):
+                    continue  # <main> imbriqué: attendre la fermeture du premier
+
+                # Un ancêtre indésirable ferait disparaître ce <main> lors du nettoyage
+                if any(self._is_unwanted_lxml(ancestor) for ancestor in ancestors):
+                    return None
+
+                soup = BeautifulSoup(
+                    etree.tostring(element, encoding='unicode', with_tail=False),
+                    BS4_PARSER
+                )
+                self._remove_unwanted_elements(soup)
+
+                main_content = soup.main
+                if main_content is None or not self._is_content_rich(main_content):
+                    return None
+
+                logger.debug("Contenu trouvé avec sélecteur: main (parsing interrompu)")
+                return self._extract_text_with_structure(main_content)
+
+        return None
+
+    @staticmethod
+    def _is_unwanted_lxml(element) -> bool:
+        """Équivalent lxml du test de _remove_unwanted_elements"""
+        return bool(
+            element.tag in UNWANTED_TAGS
+            or element.get('id') in UNWANTED_IDS
+            or _UNWANTED_CLASS_RE.search(' '.join(element.get('class', '').split()))
+        )
+
     def _extract_main_content(self, soup: BeautifulSoup) -> str:
         """
         Extrait le contenu principal de la page HTML
@@ -128,39 +524,18 @@ class HTMLParser:
         return text
 
     def _remove_unwanted_elements(self, soup: BeautifulSoup):
-        """Supprime les éléments HTML indésirables"""
+        """Supprime les éléments HTML indésirables (balises, classes, IDs) en un seul parcours"""
 
-        # Éléments à supprimer complètement
-        unwanted_tags = [
-            'script', 'style', 'nav', 'header', 'footer', 'aside',
-            'noscript', 'iframe', 'object', 'embed', 'form',
-            'button', 'input', 'select', 'textarea'
-        ]
-
-        for tag in unwanted_tags:
-            for element in soup.find_all(tag):
-                element.decompose()
-
-        # Supprimer les éléments avec classes indésirables
-        unwanted_classes = [
-            'advertisement', 'ads', 'sidebar', 'menu', 'navigation',
-            'footer', 'header', 'popup', 'modal', 'cookie', 'gdpr',
-            'social', 'share', 'comment', 'related'
-        ]
-
-        for class_name in unwanted_classes:
-            for element in soup.find_all(class_=re.compile(class_name, re.I)):
-                element.decompose()
-
-        # Supprimer les éléments avec IDs indésirables
-        unwanted_ids = [
-            'header', 'footer', 'sidebar', 'menu', 'nav',
-            'advertisement', 'ads', 'popup', 'modal'
-        ]
+        # Copie de la liste: l'arbre est modifié pendant le parcours
+        for element in list(soup.descendants):
+            if element.name is None or element.decomposed:
+                continue
 
-        for id_name in unwanted_ids:
-            element = soup.find(id=id_name)
-            if element:
+            if (
+                element.name in UNWANTED_TAGS
+                or element.get('id') in UNWANTED_IDS
+                or _UNWANTED_CLASS_RE.search(' '.join(element.get('class', ())))
+            ):
                 element.decompose()
 
     def _find_main_content(self, soup: BeautifulSoup) -> BeautifulSoup:
@@ -169,33 +544,7 @@ class HTMLParser:
         par ordre de priorité
         """
 
-        # Sélecteurs de contenu principal (par priorité décroissante)
-        content_selectors = [
-            # Sélecteurs sémantiques HTML5
-            'main',
-            'article',
-
-            # Classes et IDs courants
-            '[class*="content"]',
-            '[class*="article"]',
-            '[class*="post"]',
-            '[class*="entry"]',
-            '.main-content',
-            '.post-content',
-            '.entry-content',
-            '#main-content',
-            '#content',
-            '#main',
-
-            # Conteneurs génériques
-            '[class*="container"]',
-            '[class*="wrapper"]',
-
-            # Fallback: body
-            'body'
-        ]
-
-        for selector in content_selectors:
+        for selector in CONTENT_SELECTORS:
             try:
                 element = soup.select_one(selector)
                 if element and self._is_content_rich(element):
@@ -239,26 +588,29 @@ class HTMLParser:
         seen_texts = set()  # Éviter les doublons
 
         for child in element.descendants:
-            if child.name in ['p', 'div', 'section', 'article']:
+            if child.name == 'p':
                 # Nouveau paragraphe
                 para_text = child.get_text(separator=' ', strip=True)
-                if para_text and len(para_text.split()) > 3 and para_text not in seen_texts:
+                key = _text_key(para_text)
+                if para_text and len(para_text.split()) > 3 and key not in seen_texts:
                     text_parts.append(para_text)
-                    seen_texts.add(para_text)
+                    seen_texts.add(key)
 
             elif child.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
                 # Titre
                 title_text = child.get_text(strip=True)
-                if title_text and title_text not in seen_texts:
+                key = _text_key(title_text)
+                if title_text and key not in seen_texts:
                     text_parts.append(f"\n## {title_text}\n")
-                    seen_texts.add(title_text)
+                    seen_texts.add(key)
 
             elif child.name == 'li':
                 # Élément de liste
                 li_text = child.get_text(strip=True)
-                if li_text and li_text not in seen_texts:
+                key = _text_key(li_text)
+                if li_text and key not in seen_texts:
                     text_parts.append(f"• {li_text}")
-                    seen_texts.add(li_text)
+                    seen_texts.add(key)
 
         # Si aucun texte structuré trouvé, fallback sur get_text()
         if not text_parts:
@@ -271,33 +623,117 @@ class HTMLParser:
 
         return text
 
+    def _extract_main_content_lexbor(self, tree) -> str:
+        """Équivalent de _extract_main_content sur un arbre Lexbor (selectolax)"""
+        self._remove_unwanted_nodes(tree)
+        main_content = self._find_main_node(tree)
+        return self._extract_node_text_with_structure(main_content)
+
+    def _remove_unwanted_nodes(self, tree):
+        """Supprime balises, classes et IDs indésirables en une seule passe CSS"""
+        matches = tree.css(_UNWANTED_SELECTOR)
+
+        # Ne détruire que les nœuds de plus haut niveau: un descendant d'un nœud
+        # déjà supprimé est libéré avec lui
+        matched_ids = {node.mem_id for node in matches}
+        for node in [node for node in matches if not self._has_matched_ancestor(node, matched_ids)]:
+            node.decompose()
+
+    @staticmethod
+    def _has_matched_ancestor(node, matched_ids: set) -> bool:
+        """Vérifie si un ancêtre du nœud fait partie des correspondances"""
+        parent = node.parent
+        while parent is not None:
+            if parent.mem_id in matched_ids:
+                return True
+            parent = parent.parent
+        return False
+
+    def _find_main_node(self, tree):
+        """Équivalent de _find_main_content sur un arbre Lexbor"""
+        for selector in CONTENT_SELECTORS:
+            try:
+                node = tree.css_first(selector)
+                if node is not None and self._is_node_content_rich(node):
+                    logger.debug(f"Contenu trouvé avec sélecteur: {selector}")
+                    return node
+            except Exception:
+                continue
+
+        logger.debug("Fallback: utilisation du body complet")
+        return tree.body or tree.root
+
+    def _is_node_content_rich(self, node) -> bool:
+        """Équivalent de _is_content_rich sur un nœud Lexbor"""
+        word_count = len(node.text().split())
+        link_density = len(node.css('a')) / max(word_count, 1)
+
+        return word_count >= 50 and link_density <= 0.8
+
+    def _extract_node_text_with_structure(self, node) -> str:
+        """Équivalent de _extract_text_with_structure sur un nœud Lexbor"""
+
+        if node is None:
+            return ""
+
+        text_parts = []
+        seen_texts = set()
+
+        # css() inclut le nœud lui-même s'il correspond (descendants seulement chez BS4)
+        children = node.css(_STRUCTURE_SELECTOR)
+        if children and children[0].mem_id == node.mem_id:
+            children = children[1:]
+
+        for child in children:
+            tag = child.tag
+            if tag == 'p':
+                para_text = _lexbor_text(child, ' ')
+                key = _text_key(para_text)
+                if para_text and len(para_text.split()) > 3 and key not in seen_texts:
+                    text_parts.append(para_text)
+                    seen_texts.add(key)
+
+            elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+                title_text = child.text(strip=True)
+                key = _text_key(title_text)
+                if title_text and key not in seen_texts:
+                    text_parts.append(f"\n## {title_text}\n")
+                    seen_texts.add(key)
+
+            elif tag == 'li':
+                li_text = child.text(strip=True)
+                key = _text_key(li_text)
+                if li_text and key not in seen_texts:
+                    text_parts.append(f"• {li_text}")
+                    seen_texts.add(key)
+
+        if not text_parts:
+            logger.debug("Fallback: utilisation de text() simple")
+            return _lexbor_text(node, '\n')
+
+        return '\n\n'.join(text_parts)
+
     def _clean_text(self, text: str) -> str:
         """Nettoie et normalise le texte extrait"""
 
         if not text:
             return ""
 
-        # Supprimer les caractères de contrôle
-        text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
-
-        # Normaliser les espaces
-        text = re.sub(r' +', ' ', text)
-
-        # Supprimer les lignes vides multiples
-        text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)
+        # Supprimer les caractères de contrôle (sauts de ligne compris: le texte
+        # tient ensuite sur une seule ligne)
+        text = _CTRL_RE.sub('', text)
 
-        # Nettoyer les fins de lignes
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        text = '\n'.join(lines)
+        # Normaliser les espaces et nettoyer les extrémités
+        text = _SPACES_RE.sub(' ', text).strip()
 
         # Supprimer les caractères spéciaux indésirables (mais garder la ponctuation)
-        text = re.sub(r'[^\w\s\n.,!?\-()\[\]{}:;"\'/\\]', '', text)
+        text = _SPECIAL_RE.sub('', text)
 
         # Supprimer les URLs longues
-        text = re.sub(r'https?://[^\s]{50,}', '[URL]', text)
+        text = _LONGURL_RE.sub('[URL]', text)
 
         # Limiter les répétitions de caractères
-        text = re.sub(r'(.)\1{3,}', r'\1\1\1', text)
+        text = _REPEAT_RE.sub(r'\1\1\1', text)
 
         return text.strip()
 
@@ -336,35 +772,33 @@ class TextChunker:
             return []
 
         words = text.split()
+        n_words = len(words)
         chunks = []
 
         if metadata is None:
             metadata = {}
 
-        # Découpage avec chevauchement
-        step = self.chunk_size - self.overlap
+        # Texte normalisé construit une seule fois: chaque chunk en est une tranche
+        normalized = ' '.join(words)
+        starts, ends = _word_offsets(words)
 
-        for i in range(0, len(words), step):
-            chunk_words = words[i:i + self.chunk_size]
-            chunk_text = ' '.join(chunk_words)
-
-            # Vérifier la taille minimale
-            if len(chunk_words) < self.min_chunk_size // 2:  # Chunk trop petit
-                continue
+        # Découpage avec chevauchement (chunks trop petits déjà écartés)
+        bounds = _chunk_indices(n_words, self.chunk_size, self.overlap, self.min_chunk_size)
 
+        for chunk_id, start_word, end_word in bounds:
             chunk_data = {
-                "text": chunk_text,
-                "chunk_id": len(chunks),
-                "start_word": i,
-                "end_word": min(i + self.chunk_size, len(words)),
-                "word_count": len(chunk_words),
+                "text": normalized[starts[start_word]:ends[end_word - 1]],
+                "chunk_id": chunk_id,
+                "start_word": start_word,
+                "end_word": end_word,
+                "word_count": end_word - start_word,
                 "source": "web_parsed",
                 **metadata
             }
 
             chunks.append(chunk_data)
 
-        logger.info(f"Texte découpé: {len(words)} mots → {len(chunks)} chunks")
+        logger.info(f"Texte découpé: {n_words} mots → {len(chunks)} chunks")
         return chunks
 
     def chunk_by_sections(self, text: str, metadata: Dict[str, Any] = None) -> List[Dict[str, Any]]:
@@ -376,7 +810,7 @@ class TextChunker:
             return []
 
         # Diviser par sections (détecter les titres ##)
-        sections = re.split(r'\n##\s+', text)
+        sections = _SECTION_RE.split(text)
         chunks = []
 
         if metadata is None:
@@ -403,14 +837,20 @@ class WebContentProcessor:
     Combine parsing HTML et chunking pour l'intégration RAG
     """
 
-    def __init__(self, chunk_size: int = 500, overlap: int = 50):
+    # Téléchargements parallèles (chemin synchrone)
+    MAX_FETCH_WORKERS = 8
+
+    def __init__(self, chunk_size: int = 500, overlap: int = 50, prefer_snippet: bool = False):
         """
         Args:
             chunk_size: Taille des chunks
             overlap: Chevauchement entre chunks
+            prefer_snippet: Utiliser directement les extraits de recherche assez longs
+                au lieu de télécharger la page
         """
         self.parser = HTMLParser()
         self.chunker = TextChunker(chunk_size=chunk_size, overlap=overlap)
+        self.prefer_snippet = prefer_snippet
 
         logger.info("WebContentProcessor initialisé")
 
@@ -430,10 +870,58 @@ class WebContentProcessor:
             logger.warning("URL manquante dans le résultat de recherche")
             return []
 
+        # Extrait de recherche suffisant: ni téléchargement ni parsing
+        snippet_chunks = self._chunk_snippet(search_result, url)
+        if snippet_chunks:
+            return snippet_chunks
+
         logger.info(f"Traitement de l'URL: {url}")
 
         # Parser l'URL
         text = self.parser.parse_url(url)
+        return self._chunk_page(search_result, url, text)
+
+    async def aprocess_search_result(self, client: "httpx.AsyncClient", search_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Version asynchrone de process_search_result sur un client httpx partagé"""
+
+        url = search_result.get("url")
+        if not url:
+            logger.warning("URL manquante dans le résultat de recherche")
+            return []
+
+        snippet_chunks = self._chunk_snippet(search_result, url)
+        if snippet_chunks:
+            return snippet_chunks
+
+        logger.info(f"Traitement de l'URL: {url}")
+
+        text = await self.parser.aparse_url(client, url)
+        return self._chunk_page(search_result, url, text)
+
+    def _chunk_snippet(self, search_result: Dict[str, Any], url: str) -> List[Dict[str, Any]]:
+        """
+        Découpe l'extrait du résultat de recherche s'il suffit (prefer_snippet)
+        Retourne une liste vide si la page doit être téléchargée
+        """
+        if not self.prefer_snippet:
+            return []
+
+        snippet = search_result.get("snippet", "")
+        if len(snippet) < self.chunker.min_chunk_size * 4:
+            return []
+
+        logger.info(f"Extrait de recherche utilisé sans téléchargement: {url}")
+        return self._chunk_page(search_result, url, snippet, source_type="search_snippet")
+
+    def _chunk_page(
+        self,
+        search_result: Dict[str, Any],
+        url: str,
+        text: Optional[str],
+        source_type: str = "web_page"
+    ) -> List[Dict[str, Any]]:
+        """Découpe le texte d'une page parsée en chunks avec ses métadonnées"""
+
         if not text:
             logger.warning(f"Impossible de parser l'URL: {url}")
             return []
@@ -445,7 +933,7 @@ class WebContentProcessor:
             "title": search_result.get("title", ""),
             "search_query": search_result.get("query", ""),
             "timestamp": search_result.get("timestamp", 0),
-            "source_type": "web_page"
+            "source_type": source_type
         }
 
         # Découper en chunks
@@ -454,22 +942,88 @@ class WebContentProcessor:
         logger.info(f"Page traitée: {url} → {len(chunks)} chunks")
         return chunks
 
-    def process_multiple_results(self, search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def process_multiple_results(
+        self,
+        search_results: List[Dict[str, Any]],
+        max_urls: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Traite plusieurs résultats de recherche
 
         Args:
             search_results: Liste de résultats de recherche
+            max_urls: Nombre maximum de résultats traités (les premiers), None = tous
 
         Returns:
             Liste complète de chunks
         """
 
+        if max_urls is not None:
+            search_results = search_results[:max_urls]
+
+        # Téléchargements concurrents si httpx est disponible et qu'aucune
+        # boucle asyncio ne tourne déjà dans ce thread
+        if HTTPX_AVAILABLE:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.aprocess_multiple_results(search_results))
+
+        # Sinon: pool de threads (le GIL est relâché pendant les I/O réseau)
+        workers = max(1, min(self.MAX_FETCH_WORKERS, len(search_results)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web-fetch") as executor:
+            futures = [executor.submit(self.process_search_result, result) for result in search_results]
+
+            results_chunks = []
+            for result, future in zip(search_results, futures):
+                try:
+                    results_chunks.append(future.result())
+                except Exception as e:
+                    logger.error(f"Erreur traitement {result.get('url')}: {e}")
+                    results_chunks.append([])
+
+        return self._merge_chunks(search_results, results_chunks)
+
+    async def aprocess_multiple_results(
+        self,
+        search_results: List[Dict[str, Any]],
+        max_urls: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Traite plusieurs résultats de recherche en parallèle
+        Un seul client httpx partagé: les connexions keep-alive sont réutilisées
+
+        Args:
+            search_results: Liste de résultats de recherche
+            max_urls: Nombre maximum de résultats traités (les premiers), None = tous
+
+        Returns:
+            Liste complète de chunks (dans l'ordre des résultats)
+        """
+
+        if max_urls is not None:
+            search_results = search_results[:max_urls]
+
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.process_multiple_results, search_results)
+
+        async with httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        ) as client:
+            results_chunks = await asyncio.gather(*(
+                self.aprocess_search_result(client, result)
+                for result in search_results
+            ))
+
+        return self._merge_chunks(search_results, results_chunks)
+
+    def _merge_chunks(self, search_results: List[Dict[str, Any]], results_chunks: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Concatène les chunks des pages parsées avec succès"""
+
         all_chunks = []
         successful_parses = 0
 
-        for result in search_results:
-            chunks = self.process_search_result(result)
+        for chunks in results_chunks:
             if chunks:  # Seulement si parsing réussi
                 all_chunks.extend(chunks)
                 successful_parses += 1
@@ -482,7 +1036,8 @@ class WebContentProcessor:
         return {
             "parser_timeout": self.parser.timeout,
             "chunk_size": self.chunker.chunk_size,
-            "chunk_overlap": self.chunker.overlap
+            "chunk_overlap": self.chunker.overlap,
+            "prefer_snippet": self.prefer_snippet
         }
 
 # Instance globale
@@ -4,12 +4,57 @@ Client LM Studio pour Phase 3 - Mini Perplexity
 Communique avec LM Studio via l'API OpenAI-compatible
 """
 
+import asyncio
+import json
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import threading
 from typing import Optional, Dict, Any, List
 
+# Client HTTP asynchrone (HTTP/2) - optionnel
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+# HTTP/2 de httpx nécessite le paquet h2 (httpx[http2]); sinon HTTP/1.1 + keep-alive
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Sérialisation JSON rapide si orjson est installé
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    _json_loads = json.loads
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
 logger = logging.getLogger(__name__)
 
+# Séquences d'arrêt des réponses avec sources: le modèle s'arrête au lieu de
+# relister les sources ou d'enchaîner sur une nouvelle question
+CONTEXT_STOP_SEQUENCES = ["\n\nQuestion:", "SOURCES:"]
+
+# Longueur maximale d'un extrait de source dans le prompt
+MAX_SNIPPET_CHARS = 512
+
+class LMStudioError(Exception):
+    """
+    Échec d'une génération LM Studio (connexion, timeout, erreur HTTP, réponse invalide)
+    Levée plutôt que renvoyée comme texte: l'appelant peut basculer sur un fallback
+    et ne pas mettre l'erreur en cache comme une réponse
+    """
+
 class LMStudioClient:
     """
     Client pour communiquer avec LM Studio
@@ -39,6 +84,21 @@ class LMStudioClient:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.timeout = timeout
+        self.session = requests.Session()  # Connexion keep-alive réutilisée entre les appels
+        # Un seul hôte (LM Studio): un seul pool, jusqu'à 10 connexions keep-alive partagées
+        # par les threads appelants.
+        # Pas de retry au niveau transport: une génération ne doit pas être rejouée.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=10,
+            max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Un httpx.AsyncClient est lié à sa boucle d'événements: un client par boucle,
+        # créé au premier appel asynchrone (asyncio.run crée une boucle à chaque appel)
+        self._async_clients: Dict[asyncio.AbstractEventLoop, "httpx.AsyncClient"] = {}
+        self._async_clients_lock = threading.Lock()
         
         logger.info(f"LMStudioClient initialisé: {base_url}, modèle={model}")
     
@@ -50,13 +110,13 @@ class LMStudioClient:
             True si connecté, False sinon
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/models",
                 timeout=5
             )
             response.raise_for_status()
             
-            models = response.json().get("data", [])
+            models = _json_loads(response.content).get("data", [])
             logger.info(f"✅ LM Studio connecté: {len(models)} modèles disponibles")
             return True
             
@@ -64,12 +124,47 @@ class LMStudioClient:
             logger.error(f"❌ LM Studio non accessible: {e}")
             return False
     
+    def _build_payload(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Construit le payload /chat/completions"""
+        messages = []
+        
+        if system_prompt:
+            messages.append({
+                "role": "system",
+                "content": system_prompt
+            })
+        
+        messages.append({
+            "role": "user",
+            "content": prompt
+        })
+        
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature or self.temperature,
+            "max_tokens": max_tokens or self.max_tokens
+        }
+        
+        if stop:
+            payload["stop"] = stop
+        
+        return payload
+    
     def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None
     ) -> str:
         """
         Génère une réponse avec LM Studio
@@ -79,62 +174,47 @@ class LMStudioClient:
             system_prompt: Prompt système (optionnel)
             temperature: Override température
             max_tokens: Override max_tokens
+            stop: Séquences d'arrêt (optionnel)
             
         Returns:
             Réponse générée
+
+        Raises:
+            LMStudioError: LM Studio injoignable, timeout, erreur HTTP ou réponse invalide
         """
         try:
-            # Construire les messages
-            messages = []
-            
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-            
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
-            
-            # Paramètres de génération
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature or self.temperature,
-                "max_tokens": max_tokens or self.max_tokens
-            }
+            payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, stop)
             
             logger.debug(f"Génération LM Studio: {len(prompt)} caractères")
             
             # Appel API
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/chat/completions",
-                json=payload,
+                data=_json_dumps(payload),
+                headers=JSON_HEADERS,
                 timeout=self.timeout
             )
             
             response.raise_for_status()
             
             # Extraire la réponse
-            result = response.json()
+            result = _json_loads(response.content)
             answer = result["choices"][0]["message"]["content"]
             
             logger.info(f"✅ Réponse générée: {len(answer)} caractères")
             return answer
             
-        except requests.exceptions.Timeout:
+        except requests.exceptions.Timeout as e:
             logger.error("⏰ Timeout lors de la génération")
-            return "Désolé, la génération a pris trop de temps. Veuillez réessayer."
+            raise LMStudioError("La génération a pris trop de temps") from e
             
-        except requests.exceptions.ConnectionError:
+        except requests.exceptions.ConnectionError as e:
             logger.error("🌐 LM Studio non accessible")
-            return "Erreur: LM Studio n'est pas accessible. Vérifiez qu'il est bien lancé sur le port 1234."
+            raise LMStudioError("LM Studio n'est pas accessible") from e
             
         except Exception as e:
             logger.error(f"💥 Erreur génération: {e}")
-            return f"Erreur lors de la génération: {str(e)}"
+            raise LMStudioError(f"Erreur lors de la génération: {e}") from e
     
     def generate_with_context(
         self,
@@ -153,8 +233,29 @@ class LMStudioClient:
             
         Returns:
             Réponse avec citations [1], [2], etc.
+
+        Raises:
+            LMStudioError: voir generate
         """
         
+        system_prompt, user_prompt = self._build_context_prompts(question, context, sources)
+
+        return self.generate(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.3,  # Plus bas pour plus de précision
+            max_tokens=400,  # Borne serrée: réponses synthétiques avec citations
+            stop=CONTEXT_STOP_SEQUENCES
+        )
+    
+    def _build_context_prompts(
+        self,
+        question: str,
+        context: str,
+        sources: List[Dict[str, str]]
+    ) -> tuple[str, str]:
+        """Construit les prompts système et utilisateur avec sources numérotées"""
+        
         # Construire le prompt système
         system_prompt = """Tu es un assistant de recherche intelligent et précis.
 
@@ -166,12 +267,19 @@ RÈGLES IMPORTANTES:
 5. Structure ta réponse de manière claire avec des paragraphes
 6. N'invente JAMAIS d'informations"""
 
-        # Construire le prompt utilisateur avec sources numérotées
+        # Une seule entrée par URL (ou par début d'extrait si l'URL manque):
+        # les doublons coûtent des tokens de prompt sans rien apporter
+        unique_sources = {}
+        for source in sources:
+            key = source.get('url') or source.get('snippet', '')[:256]
+            unique_sources.setdefault(key, source)
+        
+        # Construire le prompt utilisateur avec sources numérotées (extraits plafonnés)
         sources_text = "\n\n".join([
             f"[{i+1}] {source.get('title', 'Sans titre')}\n"
             f"URL: {source.get('url', 'N/A')}\n"
-            f"Contenu: {source.get('snippet', '')}"
-            for i, source in enumerate(sources)
+            f"Contenu: {source.get('snippet', '')[:MAX_SNIPPET_CHARS]}"
+            for i, source in enumerate(unique_sources.values())
         ])
         
         user_prompt = f"""SOURCES DISPONIBLES:
@@ -184,13 +292,123 @@ QUESTION: {question}
 
 Réponds à la question en citant tes sources avec [1], [2], etc."""
 
-        return self.generate(
+        return system_prompt, user_prompt
+    
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """
+        Client asynchrone de la boucle courante (HTTP/2 si h2 est installé + pool de connexions)
+        Les requêtes concurrentes vers LM Studio réutilisent la même connexion
+        """
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=100)
+            )
+            with self._async_clients_lock:
+                # Clients des boucles terminées: leurs connexions ne sont plus utilisables
+                for closed_loop in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[closed_loop]
+                self._async_clients[loop] = client
+        return client
+    
+    async def atest_connection(self) -> bool:
+        """Version asynchrone de test_connection (non bloquante)"""
+        if not HTTPX_AVAILABLE:
+            return await asyncio.to_thread(self.test_connection)
+        
+        try:
+            response = await self._get_async_client().get(
+                f"{self.base_url}/models",
+                timeout=5
+            )
+            response.raise_for_status()
+            return True
+            
+        except Exception as e:
+            logger.debug(f"LM Studio non accessible: {e}")
+            return False
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        stop: Optional[List[str]] = None
+    ) -> str:
+        """
+        Version asynchrone de generate via le client HTTP/2 partagé
+        
+        Returns:
+            Réponse générée
+
+        Raises:
+            LMStudioError: voir generate
+        """
+        if not HTTPX_AVAILABLE:
+            logger.warning("httpx non installé - génération synchrone dans un thread")
+            return await asyncio.to_thread(
+                self.generate, prompt, system_prompt, temperature, max_tokens, stop
+            )
+        
+        try:
+            payload = self._build_payload(prompt, system_prompt, temperature, max_tokens, stop)
+            
+            logger.debug(f"Génération LM Studio (async): {len(prompt)} caractères")
+            
+            response = await self._get_async_client().post(
+                f"{self.base_url}/chat/completions",
+                content=_json_dumps(payload),
+                headers=JSON_HEADERS
+            )
+            
+            response.raise_for_status()
+            
+            result = _json_loads(response.content)
+            answer = result["choices"][0]["message"]["content"]
+            
+            logger.info(f"✅ Réponse générée: {len(answer)} caractères")
+            return answer
+            
+        except httpx.TimeoutException as e:
+            logger.error("⏰ Timeout lors de la génération")
+            raise LMStudioError("La génération a pris trop de temps") from e
+            
+        except httpx.ConnectError as e:
+            logger.error("🌐 LM Studio non accessible")
+            raise LMStudioError("LM Studio n'est pas accessible") from e
+            
+        except Exception as e:
+            logger.error(f"💥 Erreur génération: {e}")
+            raise LMStudioError(f"Erreur lors de la génération: {e}") from e
+    
+    async def agenerate_with_context(
+        self,
+        question: str,
+        context: str,
+        sources: List[Dict[str, str]]
+    ) -> str:
+        """Version asynchrone de generate_with_context"""
+        system_prompt, user_prompt = self._build_context_prompts(question, context, sources)
+        
+        return await self.agenerate(
             prompt=user_prompt,
             system_prompt=system_prompt,
-            temperature=0.3,  # Plus bas pour plus de précision
-            max_tokens=1000  # Réduit pour réponses plus rapides
+            temperature=0.3,
+            max_tokens=400,
+            stop=CONTEXT_STOP_SEQUENCES
         )
     
+    async def aclose(self):
+        """Ferme le client asynchrone de la boucle courante"""
+        with self._async_clients_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques du client"""
         return {
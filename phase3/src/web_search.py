@@ -4,61 +4,269 @@ Module de recherche web pour Phase 3 - Ask-the-Web Agent
 Utilise DuckDuckGo pour des recherches web fiables et respectueuses
 """
 
-from ddgs import DDGS
-from typing import List, Dict, Any
-import requests
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Dict, Any, TYPE_CHECKING
+import asyncio
+import atexit
+import hashlib
+import os
+import random
+import re
+import threading
 import time
 import logging
+import shelve
 from pathlib import Path
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+# ddgs et requests sont importés à la première recherche: l'import du module
+# (tests du circuit breaker, statistiques) ne paie pas leur coût de chargement
+if TYPE_CHECKING:
+    from ddgs import DDGS
+
+# Logger du module (configuration laissée à l'application)
 logger = logging.getLogger(__name__)
 
+# Validation des résultats (compilée une fois)
+_URL_MATCH = re.compile(r'https?://').match
+
+@dataclass(slots=True)
+class SearchResult:
+    """Résultat DuckDuckGo brut (slots: pas de __dict__ par résultat, accès par attribut)"""
+    title: str
+    url: str
+    snippet: str
+    source: str
+    timestamp: float
+    query: str
+
+    def asdict(self) -> Dict[str, Any]:
+        """Forme dictionnaire exposée par l'API publique"""
+        return {
+            "title": self.title,
+            "url": self.url,
+            "snippet": self.snippet,
+            "source": self.source,
+            "timestamp": self.timestamp,
+            "query": self.query
+        }
+
+def _unique_queries(queries: List[str]) -> Dict[str, str]:
+    """Requête normalisée → première requête d'origine correspondante (ordre conservé)"""
+    unique = {}
+    for query in queries:
+        unique.setdefault(query.strip().lower(), query)
+    return unique
+
+def _expand_results(
+    queries: List[str],
+    results_by_key: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Associe chaque requête d'origine aux résultats de sa forme normalisée
+    Les doublons reçoivent une copie pour ne pas partager les mêmes dictionnaires
+    """
+    results = {}
+    served = set()
+    for query in queries:
+        key = query.strip().lower()
+        key_results = results_by_key[key]
+        if key in served:
+            key_results = [dict(result) for result in key_results]
+        served.add(key)
+        results[query] = key_results
+    return results
+
+def _sleep_with_jitter(seconds: float, jitter: float = 0.5):
+    """
+    Attente de retry avec gigue aléatoire (±jitter)
+    Les threads en échec simultané ne relancent pas tous DuckDuckGo au même instant
+    """
+    time.sleep(seconds * random.uniform(1 - jitter, 1 + jitter))
+
+def _clean_result(result: SearchResult):
+    """
+    Nettoie un résultat de recherche et le convertit en dictionnaire
+    Retourne None si l'URL n'est pas http(s) ou si le contenu est trop court
+    """
+    title = result.title
+    snippet = result.snippet
+
+    # Rejet rapide: trop court même avant nettoyage
+    if len(title) < 3 or len(snippet) < 10 or not _URL_MATCH(result.url):
+        return None
+
+    title = title.strip()
+    snippet = snippet.strip()
+    if len(title) < 3 or len(snippet) < 10:
+        return None
+
+    result.title = title
+    result.snippet = snippet
+    return result.asdict()
+
+# Cache de résultats partagé par toutes les instances du processus:
+# (requête normalisée, max_results) -> (expiration monotone, résultats)
+_SHARED_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_SHARED_CACHE_LOCK = threading.Lock()
+
+# Persistance optionnelle sur disque entre exécutions (diskcache si installé, sinon shelve)
+try:
+    from diskcache import Cache as DiskCache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+WEB_SEARCH_CACHE_DIR = os.getenv("WEB_SEARCH_CACHE_DIR")
+_disk_cache = None
+
+def _get_disk_cache():
+    """Ouvre le cache disque à la demande (None si WEB_SEARCH_CACHE_DIR n'est pas défini)"""
+    global _disk_cache
+    if _disk_cache is None and WEB_SEARCH_CACHE_DIR:
+        if DISKCACHE_AVAILABLE:
+            # SQLite: sûr entre processus, expiration gérée par diskcache
+            _disk_cache = DiskCache(WEB_SEARCH_CACHE_DIR)
+        else:
+            os.makedirs(WEB_SEARCH_CACHE_DIR, exist_ok=True)
+            _disk_cache = shelve.open(os.path.join(WEB_SEARCH_CACHE_DIR, "web_search"))
+        atexit.register(_disk_cache.close)
+    return _disk_cache
+
+def _disk_key(key: tuple) -> str:
+    """Clé disque (chaîne) dérivée de la clé de cache"""
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+def _disk_store(disk_cache, key: tuple, results: List[Dict[str, Any]], ttl: float):
+    """
+    Écrit des résultats dans le cache disque
+    Expiration en heure murale: l'horloge monotone ne survit pas au processus
+    """
+    entry = (time.time() + ttl, results)
+    if DISKCACHE_AVAILABLE:
+        disk_cache.set(_disk_key(key), entry, expire=ttl)
+    else:
+        disk_cache[_disk_key(key)] = entry
+        disk_cache.sync()
+
 class CircuitBreaker:
     """
     Pattern Circuit Breaker pour éviter les appels répétés en cas de panne
+
+    Les appels sont mesurés sur une fenêtre glissante (sampling_duration): le circuit
+    s'ouvre si la fenêtre contient au moins failure_threshold échecs représentant au
+    moins failure_ratio des appels. Des échecs sporadiques dans un processus long ne
+    s'accumulent donc plus indéfiniment.
     """
 
-    def __init__(self, failure_threshold: int = 5, recovery_timeout: int = 60):
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: int = 60,
+        sampling_duration: float = 60,
+        failure_ratio: float = 0.5
+    ):
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
-        self.failure_count = 0
+        self.sampling_duration = sampling_duration
+        self.failure_ratio = failure_ratio
         self.last_failure_time = None
         self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
+        # Fenêtre glissante des appels: (instant, succès)
+        self._window = deque()
+        # Transitions d'état protégées: recherches exécutées depuis plusieurs threads
+        self._lock = threading.Lock()
+        self._probe_in_flight = False
+
+    @property
+    def failure_count(self) -> int:
+        """Nombre d'échecs dans la fenêtre glissante"""
+        with self._lock:
+            self._prune(time.monotonic())
+            return sum(1 for _, ok in self._window if not ok)
 
     def call(self, func, *args, **kwargs):
-        if self.state == "OPEN":
-            if time.time() - self.last_failure_time > self.recovery_timeout:
-                self.state = "HALF_OPEN"
-            else:
-                raise Exception("Circuit breaker is OPEN")
+        with self._lock:
+            if self.state == "OPEN":
+                # Horloge monotone: insensible aux ajustements de l'heure système
+                if time.monotonic() - self.last_failure_time > self.recovery_timeout:
+                    self.state = "HALF_OPEN"
+                else:
+                    raise Exception("Circuit breaker is OPEN")
+
+            # Un seul appel d'essai en HALF_OPEN: les autres sont rejetés jusqu'à son résultat
+            probe = self.state == "HALF_OPEN"
+            if probe:
+                if self._probe_in_flight:
+                    raise Exception("Circuit breaker is HALF_OPEN (trial call in progress)")
+                self._probe_in_flight = True
 
+        # Appel hors verrou: les recherches restent concurrentes
         try:
             result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            raise e
-
-    def _on_success(self):
-        self.failure_count = 0
-        self.state = "CLOSED"
-
-    def _on_failure(self):
-        self.failure_count += 1
-        self.last_failure_time = time.time()
-
-        if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
+        except BaseException:
+            self._record(False, probe)
+            raise
+
+        self._record(True, probe)
+        return result
+
+    def _prune(self, now: float):
+        """Retire les appels sortis de la fenêtre (verrou déjà acquis)"""
+        window = self._window
+        horizon = now - self.sampling_duration
+        while window and window[0][0] < horizon:
+            window.popleft()
+
+    def _record(self, ok: bool, probe: bool = False):
+        """Enregistre le résultat d'un appel et met à jour l'état du circuit"""
+        with self._lock:
+            # Appel lancé circuit fermé mais terminé après l'ouverture: ignoré
+            if not probe and self.state != "CLOSED":
+                return
+
+            now = time.monotonic()
+            if not ok:
+                self.last_failure_time = now
+
+            # Appel d'essai après ouverture: il décide seul de l'état
+            if probe:
+                self._probe_in_flight = False
+                self._window.clear()
+                if ok:
+                    self.state = "CLOSED"
+                else:
+                    self._window.append((now, ok))
+                    self.state = "OPEN"
+                return
+
+            self._window.append((now, ok))
+            if ok:
+                return
+
+            self._prune(now)
+            failures = sum(1 for _, call_ok in self._window if not call_ok)
+            if (
+                failures >= self.failure_threshold
+                and failures / len(self._window) >= self.failure_ratio
+            ):
+                self.state = "OPEN"
 
 class WebSearchEngine:
     """
     Moteur de recherche web utilisant DuckDuckGo avec gestion d'erreurs robuste
     """
 
-    def __init__(self, max_retries: int = 3, timeout: int = 10, max_results: int = 5):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        timeout: int = 10,
+        max_results: int = 5,
+        cache_size: int = 256,
+        cache_ttl_seconds: int = 300,
+        max_concurrent: int = 8
+    ):
         """
         Initialise le moteur de recherche
 
@@ -66,12 +274,29 @@ class WebSearchEngine:
             max_retries: Nombre maximum de tentatives
             timeout: Timeout par requête (secondes)
             max_results: Nombre maximum de résultats par défaut
+            cache_size: Nombre maximum de recherches en cache (LRU)
+            cache_ttl_seconds: Durée de vie d'une recherche en cache
+            max_concurrent: Nombre maximum de recherches DuckDuckGo simultanées
         """
         self.max_retries = max_retries
         self.timeout = timeout
         self.max_results = max_results
+        self.max_concurrent = max_concurrent
         self.circuit_breaker = CircuitBreaker()
 
+        # Limite globale des appels en vol: évite le rate-limit 429 (attente de 60s)
+        self._inflight = threading.BoundedSemaphore(max_concurrent)
+
+        # Cache LRU+TTL partagé entre instances (et sur disque si WEB_SEARCH_CACHE_DIR)
+        self._cache = _SHARED_CACHE
+        self._cache_max = cache_size
+        self._cache_ttl = cache_ttl_seconds
+        self._cache_lock = _SHARED_CACHE_LOCK
+
+        # Session DDGS partagée (créée au premier appel): conserve les connexions keep-alive
+        self._ddgs = None
+        self._ddgs_lock = threading.Lock()
+
         logger.info("WebSearchEngine initialisé")
 
     def search(self, query: str, max_results: int = None) -> List[Dict[str, Any]]:
@@ -85,158 +310,279 @@ class WebSearchEngine:
         Returns:
             Liste des résultats validés
         """
+        # Requête vide: aucun appel réseau, et aucun échec compté par le circuit breaker
+        normalized = query.strip().lower() if query else ""
+        if not normalized:
+            logger.debug("Requête vide ignorée")
+            return []
+
         if max_results is None:
             max_results = self.max_results
 
-        logger.info(f"Recherche: '{query}' (max {max_results} résultats)")
+        cache_key = (normalized, max_results)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            logger.debug("Cache: '%s' (%d résultats)", query, len(cached))
+            return cached
+
+        logger.debug("Recherche: '%s' (max %d résultats)", query, max_results)
 
         try:
-            # Utiliser le circuit breaker
-            results = self.circuit_breaker.call(
-                self._perform_search_with_retry,
-                query,
-                max_results
-            )
+            # Utiliser le circuit breaker (au plus max_concurrent appels en vol)
+            with self._inflight:
+                results = self.circuit_breaker.call(
+                    self._perform_search_with_retry,
+                    query,
+                    max_results
+                )
 
             # Valider et nettoyer les résultats
             valid_results = self._validate_results(results)
 
-            logger.info(f"Succès: {len(valid_results)} résultats valides")
+            logger.debug("Succès: %d résultats valides", len(valid_results))
+
+            if valid_results:
+                self._store_cached(cache_key, valid_results)
             return valid_results
 
         except Exception as e:
-            logger.error(f"Échec recherche: {e}")
+            logger.error("Échec recherche: %s", e)
             return []
 
-    def _perform_search_with_retry(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+    def _get_cached(self, key: tuple) -> List[Dict[str, Any]]:
+        """Retourne une copie des résultats en cache s'ils n'ont pas expiré, sinon None"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                # Entrée du disque: non expirée et déjà insérée en fin de LRU
+                entry = self._load_from_disk(key)
+                if entry is None:
+                    return None
+            else:
+                if entry[0] <= time.monotonic():
+                    del self._cache[key]
+                    return None
+                self._cache.move_to_end(key)
+
+            results = entry[1]
+
+        # Copie: l'appelant peut modifier les résultats sans altérer le cache
+        return [dict(result) for result in results]
+
+    def _store_cached(self, key: tuple, results: List[Dict[str, Any]]):
+        """Met en cache une copie des résultats (éviction LRU au-delà de _cache_max)"""
+        entry = (time.monotonic() + self._cache_ttl, [dict(result) for result in results])
+
+        with self._cache_lock:
+            self._insert_locked(key, entry)
+
+            disk_cache = _get_disk_cache()
+            if disk_cache is not None:
+                _disk_store(disk_cache, key, entry[1], self._cache_ttl)
+
+    def _load_from_disk(self, key: tuple):
+        """Charge une entrée du cache disque dans le cache mémoire (verrou déjà acquis)"""
+        disk_cache = _get_disk_cache()
+        if disk_cache is None:
+            return None
+
+        entry = disk_cache.get(_disk_key(key))
+        if entry is None:
+            return None
+
+        expires, results = entry
+        remaining = expires - time.time()
+        if remaining <= 0:
+            disk_cache.pop(_disk_key(key), None)
+            return None
+
+        entry = (time.monotonic() + remaining, results)
+        self._insert_locked(key, entry)
+        return entry
+
+    def _insert_locked(self, key: tuple, entry: tuple):
+        """Insère une entrée en fin de LRU et évince au-delà de _cache_max (verrou déjà acquis)"""
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    async def search_async(self, query: str, max_results: int = None) -> List[Dict[str, Any]]:
+        """
+        Version asynchrone de search
+        DDGS étant synchrone, la recherche s'exécute dans un thread
+        """
+        return await asyncio.to_thread(self.search, query, max_results)
+
+    def _get_ddgs(self) -> "DDGS":
+        """Retourne la session DDGS partagée, créée à la demande"""
+        if self._ddgs is None:
+            with self._ddgs_lock:
+                if self._ddgs is None:
+                    from ddgs import DDGS
+                    self._ddgs = DDGS(timeout=self.timeout).__enter__()
+        return self._ddgs
+
+    def close(self):
+        """Ferme la session DDGS partagée (une nouvelle sera créée au besoin)"""
+        with self._ddgs_lock:
+            ddgs, self._ddgs = self._ddgs, None
+        if ddgs is not None:
+            ddgs.__exit__(None, None, None)
+
+    async def aclose(self):
+        """Version asynchrone de close (appelée à l'arrêt de l'agent)"""
+        await asyncio.to_thread(self.close)
+
+    def _perform_search_with_retry(self, query: str, max_results: int) -> List[SearchResult]:
         """
         Effectue la recherche avec logique de retry
         """
+        from requests import exceptions as requests_exceptions
+
         last_exception = None
 
         for attempt in range(self.max_retries):
             try:
-                logger.debug(f"Tentative {attempt + 1}/{self.max_retries}")
+                logger.debug("Tentative %d/%d", attempt + 1, self.max_retries)
 
                 results = []
 
-                # Utiliser DDGS avec timeout
-                with DDGS() as ddgs:
-                    search_results = ddgs.text(
-                        query,
-                        max_results=max_results,
-                        timelimit=self.timeout
-                    )
-
-                    for result in search_results:
-                        results.append({
-                            "title": result.get("title", ""),
-                            "url": result.get("href", ""),
-                            "snippet": result.get("body", ""),
-                            "source": "duckduckgo",
-                            "timestamp": time.time(),
-                            "query": query
-                        })
+                # Utiliser la session DDGS partagée (timeout HTTP fixé à sa création)
+                ddgs = self._get_ddgs()
+                search_results = ddgs.text(query, max_results=max_results)
+
+                # Horodatage unique pour tout le lot de résultats
+                now = time.time()
+                for result in search_results:
+                    results.append(SearchResult(
+                        title=result.get("title", ""),
+                        url=result.get("href", ""),
+                        snippet=result.get("body", ""),
+                        source="duckduckgo",
+                        timestamp=now,
+                        query=query
+                    ))
 
                 return results
 
-            except requests.exceptions.Timeout:
-                logger.warning(f"⏰ Timeout (tentative {attempt + 1})")
+            except requests_exceptions.Timeout:
+                logger.warning("⏰ Timeout (tentative %d)", attempt + 1)
                 last_exception = "Timeout"
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)  # Backoff exponentiel
+                    _sleep_with_jitter(2 ** attempt)  # Backoff exponentiel
 
-            except requests.exceptions.ConnectionError:
-                logger.warning(f"🌐 Erreur de connexion (tentative {attempt + 1})")
+            except requests_exceptions.ConnectionError:
+                logger.warning("🌐 Erreur de connexion (tentative %d)", attempt + 1)
                 last_exception = "Connection Error"
                 if attempt < self.max_retries - 1:
-                    time.sleep(1)
+                    _sleep_with_jitter(1)
 
-            except requests.exceptions.HTTPError as e:
+            except requests_exceptions.HTTPError as e:
                 status_code = e.response.status_code if e.response else "Unknown"
-                logger.warning(f"🔴 HTTP {status_code} (tentative {attempt + 1})")
+                logger.warning("🔴 HTTP %s (tentative %d)", status_code, attempt + 1)
 
                 last_exception = f"HTTP {status_code}"
 
                 # Gestion spécifique des erreurs HTTP
                 if status_code == 429:  # Rate limit
                     wait_time = 60
-                    logger.info(f"⏳ Rate limit - attente {wait_time}s")
-                    time.sleep(wait_time)
+                    logger.info("⏳ Rate limit - attente ~%ds", wait_time)
+                    _sleep_with_jitter(wait_time, jitter=0.2)
                     continue
                 elif status_code >= 500:  # Erreur serveur
                     if attempt < self.max_retries - 1:
-                        time.sleep(5)
+                        _sleep_with_jitter(5)
                         continue
                 else:
                     # Erreur client (4xx) - ne pas retry
                     break
 
             except Exception as e:
-                logger.error(f"💥 Erreur inattendue: {e}")
+                logger.error("💥 Erreur inattendue: %s", e)
                 last_exception = str(e)
                 if attempt < self.max_retries - 1:
-                    time.sleep(1)
+                    _sleep_with_jitter(1)
 
         # Toutes les tentatives ont échoué
         raise Exception(f"Échec après {self.max_retries} tentatives. Dernière erreur: {last_exception}")
 
-    def _validate_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _validate_results(self, results: List[SearchResult]) -> List[Dict[str, Any]]:
         """
         Valide et nettoie les résultats de recherche
         """
-        valid_results = []
-
-        for result in results:
-            # Vérifier champs requis
-            required_fields = ["title", "url", "snippet"]
-            if not all(field in result for field in required_fields):
-                continue
-
-            # Valider URL
-            url = result["url"]
-            if not url.startswith(("http://", "https://")):
-                continue
-
-            # Nettoyer et valider contenu
-            title = result["title"].strip()
-            snippet = result["snippet"].strip()
-
-            if not title or not snippet:
-                continue
-
-            # Éviter les résultats trop courts
-            if len(title) < 3 or len(snippet) < 10:
-                continue
+        # Une seule passe: chaque résultat est nettoyé ou écarté par _clean_result
+        valid_results = [
+            result for result in map(_clean_result, results)
+            if result is not None
+        ]
 
-            # Nettoyer et garder
-            result["title"] = title
-            result["snippet"] = snippet
-            result["url"] = url
-
-            valid_results.append(result)
-
-        logger.debug(f"Validation: {len(results)} → {len(valid_results)} résultats valides")
+        logger.debug("Validation: %d → %d résultats valides", len(results), len(valid_results))
         return valid_results
 
-    def search_multiple_queries(self, queries: List[str], max_results_per_query: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+    def search_multiple_queries(
+        self,
+        queries: List[str],
+        max_results_per_query: int = 3,
+        max_workers: int = 8
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Effectue plusieurs recherches en parallèle
 
         Args:
             queries: Liste des requêtes
             max_results_per_query: Nombre max de résultats par requête
+            max_workers: Nombre maximum de recherches simultanées
 
         Returns:
             Dictionnaire requête → résultats
         """
-        results = {}
+        # Une seule recherche par requête normalisée
+        unique = _unique_queries(queries)
+        results_by_key = {}
+
+        if unique:
+            # Requêtes limitées par la latence réseau: les threads recouvrent les attentes
+            with ThreadPoolExecutor(max_workers=min(len(unique), max_workers)) as executor:
+                futures = {
+                    executor.submit(self.search, query, max_results_per_query): key
+                    for key, query in unique.items()
+                }
+                for future in as_completed(futures):
+                    results_by_key[futures[future]] = future.result()
+
+        logger.info("Recherches multiples terminées: %d requêtes (%d uniques)", len(queries), len(unique))
+        return _expand_results(queries, results_by_key)
+
+    async def search_multiple_queries_async(
+        self,
+        queries: List[str],
+        max_results_per_query: int = 3,
+        max_concurrency: int = 10
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Version asynchrone de search_multiple_queries
 
-        for query in queries:
-            results[query] = self.search(query, max_results_per_query)
+        Args:
+            queries: Liste des requêtes
+            max_results_per_query: Nombre max de résultats par requête
+            max_concurrency: Nombre maximum de recherches simultanées (limite le rate-limit)
 
-        logger.info(f"Recherches multiples terminées: {len(queries)} requêtes")
-        return results
+        Returns:
+            Dictionnaire requête → résultats
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded_search(query: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.search_async(query, max_results_per_query)
+
+        # Une seule recherche par requête normalisée (gather conserve l'ordre)
+        unique = _unique_queries(queries)
+        all_results = await asyncio.gather(*(bounded_search(query) for query in unique.values()))
+
+        logger.info("Recherches multiples terminées: %d requêtes (%d uniques)", len(queries), len(unique))
+        return _expand_results(queries, dict(zip(unique, all_results)))
 
     def get_search_stats(self) -> Dict[str, Any]:
         """
@@ -246,7 +592,9 @@ class WebSearchEngine:
             "circuit_breaker_state": self.circuit_breaker.state,
             "failure_count": self.circuit_breaker.failure_count,
             "max_retries": self.max_retries,
-            "timeout": self.timeout
+            "timeout": self.timeout,
+            "max_concurrent": self.max_concurrent,
+            "cached_searches": len(self._cache)
         }
 
 # Instance globale
@@ -258,6 +606,8 @@ def get_web_search_engine() -> WebSearchEngine:
 
 # Tests unitaires
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     print("🧪 Test du moteur de recherche web")
     print("=" * 50)
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour agent_orchestrator.py
+Phase 3 - Ask-the-Web Agent (analyse des questions: chemins regex et Aho-Corasick)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "phase3"))
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from src import agent_orchestrator, lmstudio_client
+from src.agent_orchestrator import SearchPlanner, WebAwareAgent
+from src.extended_rag_pipeline import ExtendedRAGPipeline
+
+# (question, needs_web, complexity, search_strategy)
+QUESTION_CASES = [
+    ("Quel est le prix du Bitcoin aujourd'hui?", True, 4, "single"),
+    ("Comparez les langages Python et Java", False, 2, "single"),
+    # "et" dans "Internet" n'est pas un connecteur (multi_aspect), "internet" reste un indicateur web
+    ("Qu'est-ce qu'Internet?", True, 0, "single"),
+    ("Quel temps fait-il? Et demain?", False, 7, "single"),
+    ("Expliquez comment fonctionne la photosynthèse chez les plantes vertes et pourquoi "
+     "les feuilles changent de couleur en automne dans les forêts tempérées", False, 4, "parallel"),
+    ("Quel est le prix actuel du Bitcoin et quelle est la différence avec Ethereum, ainsi que "
+     "les statistiques de la bourse cette année pour les investisseurs?", True, 10, "sequential"),
+]
+
+@pytest.fixture(params=["regex", "automaton"])
+def matcher(request, monkeypatch):
+    """Exécute chaque test avec les regex puis avec l'automate (si pyahocorasick est installé)"""
+    if request.param == "regex":
+        monkeypatch.setattr(agent_orchestrator, "_AUTOMATON", None)
+    elif agent_orchestrator._AUTOMATON is None:
+        pytest.skip("pyahocorasick non installé")
+
+    # analyze_question est mémoïsée: pas de résultat partagé entre les deux chemins
+    SearchPlanner.analyze_question.cache_clear()
+    yield request.param
+    SearchPlanner.analyze_question.cache_clear()
+
+class TestSearchPlanner:
+
+    @pytest.mark.parametrize("question,needs_web,complexity,strategy", QUESTION_CASES)
+    def test_analyze_question(self, matcher, question, needs_web, complexity, strategy):
+        """Analyse identique quel que soit le chemin de détection des mots-clés"""
+        analysis = SearchPlanner.analyze_question(question)
+
+        assert analysis["needs_web"] is needs_web
+        assert analysis["complexity"] == complexity
+        assert analysis["search_strategy"] == strategy
+        assert analysis["estimated_searches"] == len(analysis["sub_questions"])
+
+    def test_internet_is_not_multi_aspect(self, matcher):
+        """Le mot-clé "et" n'est compté que comme mot entier"""
+        question = "Internet"
+        categories = SearchPlanner._match_categories(question)
+
+        assert not SearchPlanner._has_category(question, categories, "multi_aspect")
+        assert SearchPlanner._has_category(question, categories, "web")
+
+    def test_analysis_is_read_only(self, matcher):
+        """Le résultat mémoïsé est partagé: il ne doit pas être modifiable"""
+        analysis = SearchPlanner.analyze_question("Quel est le prix du Bitcoin aujourd'hui?")
+
+        with pytest.raises(TypeError):
+            analysis["needs_web"] = False
+
+class StubResponse:
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode("utf-8")
+
+    def raise_for_status(self):
+        pass
+
+class LoopBoundAsyncClient:
+    """Comme httpx.AsyncClient: utilisable uniquement dans la boucle où il a été créé"""
+
+    created = []  # Instances créées (réinitialisé par la fixture agent)
+
+    def __init__(self, **kwargs):
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self.created.append(self)
+
+    def _check_loop(self):
+        if self.closed or asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Event loop is closed")
+
+    async def get(self, url, timeout=None):
+        self._check_loop()
+        return StubResponse({"data": []})
+
+    async def post(self, url, content=None, headers=None):
+        self._check_loop()
+        return StubResponse({"choices": [{"message": {"content": "Réponse LM Studio"}}]})
+
+    async def aclose(self):
+        self.closed = True
+
+class NoWebSearch:
+    def search(self, query, max_results=5):
+        return []
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Agent dont le pipeline génère via un LMStudioClient sur un httpx simulé"""
+    LoopBoundAsyncClient.created = []
+    monkeypatch.setattr(lmstudio_client, "HTTPX_AVAILABLE", True)
+    monkeypatch.setattr(lmstudio_client, "httpx", SimpleNamespace(
+        AsyncClient=LoopBoundAsyncClient,
+        Limits=lambda **kwargs: None,
+        TimeoutException=TimeoutError,
+        ConnectError=ConnectionError
+    ))
+
+    pipeline = ExtendedRAGPipeline()
+    pipeline.web_search = NoWebSearch()
+    pipeline._llm_client = lmstudio_client.LMStudioClient()
+
+    agent = WebAwareAgent()
+    agent.rag_pipeline = pipeline
+    agent.available = True
+    return agent
+
+class TestWebAwareAgent:
+
+    def test_answer_question_twice(self, agent):
+        """Chaque appel synchrone (nouvelle boucle asyncio.run) obtient une réponse LM Studio"""
+        first = agent.answer_question("Qui a écrit Les Misérables")
+        second = agent.answer_question("Qui a peint la Joconde")
+
+        assert first["answer"] == second["answer"] == "Réponse LM Studio"
+        assert first["llm_generated"] and second["llm_generated"]
+        # Un client par boucle d'événements, fermé à la fin de son appel
+        assert len(LoopBoundAsyncClient.created) == 2
+        assert all(client.closed for client in LoopBoundAsyncClient.created)
+
+    def test_answer_question_inside_running_loop(self, agent):
+        """L'API synchrone reste utilisable depuis une boucle déjà active"""
+        async def caller():
+            return agent.answer_question("Qui a écrit Les Misérables")
+
+        response = asyncio.run(caller())
+
+        assert response["answer"] == "Réponse LM Studio"
+        assert response["llm_generated"]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour le module extended_rag_pipeline.py
+Phase 3 - Ask-the-Web Agent (sans réseau ni modèle d'embeddings)
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "phase3"))
+
+import time
+
+import numpy as np
+import pytest
+from src import extended_rag_pipeline
+from src.extended_rag_pipeline import ConversationMemory, ExtendedRAGPipeline, SemanticCache
+
+def unit(*components):
+    """Vecteur normalisé (float32), comme ceux de l'EmbeddingManager"""
+    vector = np.array(components, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+class StubEmbeddingManager:
+    """Embeddings fixes: vecteur connu par texte, sinon vecteur constant"""
+
+    def __init__(self, vectors=None, dimension: int = 4):
+        self.vectors = vectors or {}
+        self.dimension = dimension
+
+    def encode_text(self, text):
+        default = np.full(self.dimension, 0.5, dtype=np.float32)
+        return self.vectors.get(text, default)
+
+    def encode_batch(self, texts):
+        return np.stack([self.encode_text(text) for text in texts])
+
+class StubVectorDB:
+    """Enregistre les appels au lieu d'écrire dans Qdrant"""
+
+    def __init__(self):
+        self.client = object()  # Déjà "connecté"
+        self.collection_name = "support_documents"
+        self.created = []
+        self.added = []
+        self.ids = []
+        self.deleted = []
+
+    def create_collection(self, vector_size, collection_name=None):
+        self.created.append((collection_name, vector_size))
+
+    def add_documents(self, documents, embeddings, ids=None):
+        assert len(documents) == len(embeddings)
+        self.added.append((documents, embeddings))
+        self.ids.append(ids)
+        return ids
+
+    def delete_older_than(self, cutoff, field="timestamp", collection_name=None):
+        self.deleted.append((collection_name, field, cutoff))
+
+class StubWebSearch:
+    """Une page par requête"""
+
+    def search(self, query, max_results=5):
+        url = "https://example.com/" + query.replace(" ", "-")
+        return [{"title": "Page", "url": url, "snippet": "extrait"}]
+
+class StubWebProcessor:
+    def process_search_result(self, result):
+        return [
+            {"text": f"Contenu de {result['url']} numéro {i}", "url": result["url"], "title": result["title"],
+             "chunk_id": i, "source_type": "web", "timestamp": 1.0}
+            for i in range(3)
+        ]
+
+class StubLLMClient:
+    """LM Studio toujours joignable, réponses comptées"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def test_connection(self):
+        return True
+
+    def generate_with_context(self, question, context, sources):
+        self.calls += 1
+        return f"Réponse à: {question}"
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge monotone contrôlée par le test (avancer avec clock[0] += secondes)"""
+    now = [1000.0]
+    monkeypatch.setattr(extended_rag_pipeline.time, "monotonic", lambda: now[0])
+    return now
+
+@pytest.fixture
+def pipeline():
+    pipeline = ExtendedRAGPipeline()
+    pipeline.embedding_manager = StubEmbeddingManager()
+    pipeline.vector_db = StubVectorDB()
+    pipeline.web_search = StubWebSearch()
+    pipeline.web_processor = StubWebProcessor()
+    return pipeline
+
+class TestWebChunkIndexing:
+
+    def test_web_chunks_reach_vector_store(self, pipeline):
+        """Les chunks web sont indexés via VectorDatabase.add_documents"""
+        chunks, queries = pipeline._search_web_enhanced("question test", max_results=1)
+
+        assert len(chunks) == 3
+        assert queries == ["question test"]
+        assert pipeline.vector_db.created == [(ExtendedRAGPipeline.WEB_COLLECTION, 4)]
+
+        documents, embeddings = pipeline.vector_db.added[0]
+        assert [doc["text"] for doc in documents] == [chunk["text"] for chunk in chunks]
+        assert all(doc["source"] == "https://example.com/question-test" for doc in documents)
+        assert all(doc["metadata"]["source_type"] == "web" for doc in documents)
+        assert embeddings.shape == (3, 4)
+
+    def test_point_ids_are_chunk_fingerprints(self, pipeline):
+        """ID de point = empreinte 64 bits du texte: stable entre exécutions"""
+        chunks, _ = pipeline._search_web_enhanced("question test", max_results=1)
+
+        [ids] = pipeline.vector_db.ids
+        assert ids == [extended_rag_pipeline._text_fingerprint(chunk["text"]) for chunk in chunks]
+        assert all(0 <= point_id < 2 ** 64 for point_id in ids)
+
+    def test_collection_created_once(self, pipeline):
+        """La collection web n'est créée qu'à la première indexation"""
+        pipeline._search_web_enhanced("première", max_results=1)
+        pipeline._search_web_enhanced("seconde", max_results=1)
+
+        assert len(pipeline.vector_db.created) == 1
+        assert len(pipeline.vector_db.added) == 2
+
+    def test_reindexing_same_page_is_skipped(self, pipeline):
+        """Une page re-téléchargée n'est ni ré-encodée ni ré-indexée"""
+        pipeline._search_web_enhanced("même page", max_results=1)
+        chunks, _ = pipeline._search_web_enhanced("même page", max_results=1)
+
+        assert len(chunks) == 3  # Les chunks restent utilisés pour la réponse
+        assert len(pipeline.vector_db.added) == 1
+
+    def test_expired_chunks_are_cleaned_up(self, pipeline):
+        """Les chunks indexés depuis plus de WEB_CHUNK_TTL sont supprimés (au plus une fois par intervalle)"""
+        before = time.time()
+        pipeline._search_web_enhanced("première", max_results=1)
+        pipeline._search_web_enhanced("seconde", max_results=1)
+
+        [(collection, field, cutoff)] = pipeline.vector_db.deleted
+        assert (collection, field) == (ExtendedRAGPipeline.WEB_COLLECTION, "indexed_at")
+        assert before - ExtendedRAGPipeline.WEB_CHUNK_TTL <= cutoff <= time.time() - ExtendedRAGPipeline.WEB_CHUNK_TTL
+
+        documents, _ = pipeline.vector_db.added[0]
+        assert all(before <= doc["metadata"]["indexed_at"] <= time.time() for doc in documents)
+
+    def test_expired_fingerprints_are_reindexed(self, pipeline):
+        """Une fois le chunk expiré (et supprimé de Qdrant), la page est ré-indexée"""
+        pipeline._search_web_enhanced("même page", max_results=1)
+        pipeline._indexed_fingerprints = dict.fromkeys(pipeline._indexed_fingerprints, 0.0)
+
+        pipeline._search_web_enhanced("même page", max_results=1)
+        assert len(pipeline.vector_db.added) == 2
+
+    def test_no_indexing_without_vector_db(self, pipeline):
+        """Sans Phase 2 (vector_db absent), les chunks web restent utilisables"""
+        pipeline.vector_db = None
+        chunks, _ = pipeline._search_web_enhanced("question test", max_results=1)
+        assert len(chunks) == 3
+
+class TestConversationMemoryCache:
+
+    def test_cache_key_ignores_word_order_and_case(self):
+        """Même clé pour les mêmes mots, quels que soient l'ordre et la casse"""
+        key = ConversationMemory.cache_key("Prix du Bitcoin", True, 3)
+        assert ConversationMemory.cache_key("bitcoin  DU prix", True, 3) == key
+
+    def test_cache_key_includes_params(self):
+        """Les paramètres de recherche font partie de la clé"""
+        key = ConversationMemory.cache_key("Prix du Bitcoin", True, 3)
+        assert ConversationMemory.cache_key("Prix du Bitcoin", False, 3) != key
+        assert ConversationMemory.cache_key("Prix du Bitcoin", True, 5) != key
+        assert ConversationMemory.cache_key("Prix de l'Ethereum", True, 3) != key
+
+    def test_cached_response_expires(self, clock):
+        """Une réponse n'est plus servie après cache_ttl_seconds"""
+        memory = ConversationMemory(cache_ttl_seconds=60)
+        memory.cache_response("clé", {"answer": "réponse"})
+
+        clock[0] += 59
+        assert memory.get_cached_response("clé") == {"answer": "réponse"}
+
+        clock[0] += 1
+        assert memory.get_cached_response("clé") is None
+        assert "clé" not in memory.search_cache
+
+    def test_lru_eviction(self):
+        """Au-delà de cache_size, la réponse la moins récemment utilisée est évincée"""
+        memory = ConversationMemory(cache_size=2)
+        memory.cache_response("a", {"answer": "a"})
+        memory.cache_response("b", {"answer": "b"})
+        memory.get_cached_response("a")  # "a" devient la plus récente
+        memory.cache_response("c", {"answer": "c"})
+
+        assert memory.get_cached_response("b") is None
+        assert memory.get_cached_response("a") == {"answer": "a"}
+        assert memory.get_cached_response("c") == {"answer": "c"}
+
+class TestSemanticCache:
+
+    def test_similarity_threshold(self):
+        """Réponse réutilisée seulement au-dessus du seuil de similarité cosinus"""
+        cache = SemanticCache(threshold=0.92)
+        cache.add(unit(1, 0, 0, 0), (True, 3), {"answer": "bitcoin"})
+
+        assert cache.lookup(unit(1, 0, 0, 0), (True, 3)) == {"answer": "bitcoin"}
+        assert cache.lookup(unit(0.95, 0.3122, 0, 0), (True, 3)) == {"answer": "bitcoin"}  # cos ≈ 0.95
+        assert cache.lookup(unit(0.8, 0.6, 0, 0), (True, 3)) is None  # cos = 0.8
+
+    def test_params_must_match(self):
+        """Une question proche avec d'autres paramètres de recherche n'est pas servie"""
+        cache = SemanticCache()
+        cache.add(unit(1, 0, 0, 0), (True, 3), {"answer": "web"})
+
+        assert cache.lookup(unit(1, 0, 0, 0), (False, 3)) is None
+
+    def test_ring_buffer_wraparound(self):
+        """Tampon plein: l'entrée la plus ancienne est remplacée"""
+        cache = SemanticCache(max_entries=2)
+        cache.add(unit(1, 0, 0, 0), (), {"answer": "a"})
+        cache.add(unit(0, 1, 0, 0), (), {"answer": "b"})
+        cache.add(unit(0, 0, 1, 0), (), {"answer": "c"})
+
+        assert len(cache) == 2
+        assert cache.lookup(unit(1, 0, 0, 0), ()) is None
+        assert cache.lookup(unit(0, 1, 0, 0), ()) == {"answer": "b"}
+        assert cache.lookup(unit(0, 0, 1, 0), ()) == {"answer": "c"}
+
+    def test_ttl_expiry(self, clock):
+        """Une réponse n'est plus servie après ttl_seconds"""
+        cache = SemanticCache(ttl_seconds=60)
+        cache.add(unit(1, 0, 0, 0), (), {"answer": "a"})
+
+        clock[0] += 59
+        assert cache.lookup(unit(1, 0, 0, 0), ()) == {"answer": "a"}
+
+        clock[0] += 1
+        assert cache.lookup(unit(1, 0, 0, 0), ()) is None
+
+class TestPipelineCaches:
+
+    @pytest.fixture
+    def cached_pipeline(self, pipeline):
+        """Pipeline avec cache sémantique et LM Studio simulé"""
+        pipeline.semantic_cache = SemanticCache()
+        pipeline._llm_client = StubLLMClient()
+        return pipeline
+
+    def test_reordered_question_hits_exact_cache(self, cached_pipeline):
+        """Même question, mots réordonnés: réponse servie sans nouvelle génération"""
+        first = cached_pipeline.ask_question("Prix du Bitcoin", use_web=False)
+        second = cached_pipeline.ask_question("bitcoin du PRIX", use_web=False)
+
+        assert second["answer"] == first["answer"]
+        assert cached_pipeline._llm_client.calls == 1
+        assert cached_pipeline.get_stats()["cache_hits"] == 1
+
+    def test_paraphrase_hits_semantic_cache(self, cached_pipeline):
+        """Question reformulée d'embedding proche: servie par le cache sémantique"""
+        cached_pipeline.embedding_manager = StubEmbeddingManager(vectors={
+            "Quel est le prix du Bitcoin ?": unit(1, 0, 0, 0),
+            "Combien coûte un Bitcoin ?": unit(0.99, 0.141, 0, 0),
+        })
+
+        first = cached_pipeline.ask_question("Quel est le prix du Bitcoin ?", use_web=False)
+        second = cached_pipeline.ask_question("Combien coûte un Bitcoin ?", use_web=False)
+
+        assert second["answer"] == first["answer"]
+        assert cached_pipeline._llm_client.calls == 1
+        assert cached_pipeline.get_stats()["semantic_cache_hits"] == 1
+
+    def test_fallback_answers_are_not_cached(self, cached_pipeline):
+        """Sans LM Studio, la réponse de secours n'est pas mise en cache"""
+        cached_pipeline._llm_client.test_connection = lambda: False
+
+        cached_pipeline.ask_question("Prix du Bitcoin", use_web=False)
+
+        assert cached_pipeline.memory.search_cache == {}
+        assert len(cached_pipeline.semantic_cache) == 0
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
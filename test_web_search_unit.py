@@ -8,9 +8,23 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import time
+from collections import OrderedDict
+
 import pytest
+from phase3.src import web_search
 from phase3.src.web_search import WebSearchEngine, CircuitBreaker
 
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge monotone contrôlée par le test (avancer avec clock[0] += secondes)"""
+    now = [1000.0]
+    monkeypatch.setattr(web_search.time, "monotonic", lambda: now[0])
+    return now
+
+def failure_func():
+    raise Exception("test error")
+
 class TestWebSearchEngine:
 
     def setup_method(self):
@@ -76,6 +90,24 @@ class TestWebSearchEngine:
         assert isinstance(stats["max_retries"], int)
         assert isinstance(stats["timeout"], int)
 
+class TestSearchCache:
+
+    def test_disk_entries_respect_cache_size(self, monkeypatch):
+        """Les entrées rechargées du disque passent par l'éviction LRU"""
+        disk = {
+            web_search._disk_key((f"requête {i}", 5)): (time.time() + 300, [{"title": str(i)}])
+            for i in range(3)
+        }
+        monkeypatch.setattr(web_search, "_get_disk_cache", lambda: disk)
+
+        engine = WebSearchEngine(cache_size=2)
+        engine._cache = OrderedDict()  # Isolé du cache partagé entre instances
+
+        for i in range(3):
+            assert engine._get_cached((f"requête {i}", 5)) == [{"title": str(i)}]
+
+        assert list(engine._cache) == [("requête 1", 5), ("requête 2", 5)]
+
 class TestCircuitBreaker:
 
     def test_initialization(self):
@@ -117,6 +149,79 @@ class TestCircuitBreaker:
         assert cb.failure_count == 2
         assert cb.state == "OPEN"
 
+    def test_failures_expire_from_window(self, clock):
+        """Les échecs sortis de la fenêtre glissante ne comptent plus"""
+        cb = CircuitBreaker(failure_threshold=2, sampling_duration=60)
+
+        with pytest.raises(Exception):
+            cb.call(failure_func)
+        clock[0] += 61
+
+        with pytest.raises(Exception):
+            cb.call(failure_func)
+        assert cb.failure_count == 1
+        assert cb.state == "CLOSED"
+
+    def test_open_half_open_closed(self, clock):
+        """OPEN -> HALF_OPEN après recovery_timeout, puis CLOSED si l'essai réussit"""
+        cb = CircuitBreaker(failure_threshold=2, recovery_timeout=30)
+        for _ in range(2):
+            with pytest.raises(Exception):
+                cb.call(failure_func)
+        assert cb.state == "OPEN"
+
+        # Avant recovery_timeout: rejeté sans appeler la fonction
+        calls = []
+        clock[0] += 10
+        with pytest.raises(Exception, match="OPEN"):
+            cb.call(calls.append, "trop tôt")
+        assert calls == []
+
+        clock[0] += 21
+
+        def probe():
+            assert cb.state == "HALF_OPEN"
+            return "ok"
+
+        assert cb.call(probe) == "ok"
+        assert cb.state == "CLOSED"
+        assert cb.failure_count == 0
+
+    def test_half_open_single_probe(self, clock):
+        """En HALF_OPEN, un seul appel d'essai passe à la fois"""
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        with pytest.raises(Exception):
+            cb.call(failure_func)
+        clock[0] += 31
+
+        concurrent_calls = []
+
+        def probe():
+            # Appel concurrent pendant l'essai: rejeté sans être exécuté
+            with pytest.raises(Exception, match="HALF_OPEN"):
+                cb.call(concurrent_calls.append, "concurrent")
+            return "ok"
+
+        assert cb.call(probe) == "ok"
+        assert concurrent_calls == []
+        assert cb.state == "CLOSED"
+        assert cb.call(lambda: "suivant") == "suivant"
+
+    def test_failed_probe_reopens(self, clock):
+        """Un essai en échec rouvre le circuit pour un nouveau recovery_timeout"""
+        cb = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        with pytest.raises(Exception):
+            cb.call(failure_func)
+        clock[0] += 31
+
+        with pytest.raises(Exception, match="test error"):
+            cb.call(failure_func)
+        assert cb.state == "OPEN"
+
+        clock[0] += 10
+        with pytest.raises(Exception, match="OPEN"):
+            cb.call(lambda: "trop tôt")
+
 if __name__ == "__main__":
     # Exécution simple des tests
     print("🧪 Exécution des tests unitaires web_search.py")